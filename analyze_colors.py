@@ -3,14 +3,19 @@ Analyze Terraria textures pixel-by-pixel to determine accurate color tags.
 Run this once to generate tile_tags.json for the paint app.
 """
 
+import hashlib
+import io
 import json
+import os
 from pathlib import Path
 from PIL import Image
-from collections import Counter
-import re
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 TEXTURE_DIR = Path(__file__).parent / "textures"
 OUTPUT_FILE = Path(__file__).parent / "tile_tags.json"
+CACHE_FILE = Path(__file__).parent / "tile_tags.cache.json"
 
 # Import names
 try:
@@ -19,6 +24,18 @@ except ImportError:
     TILE_NAMES = {}
     WALL_NAMES = {}
 
+# Optional: Aho-Corasick keyword matcher (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: faster JSON writer (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Furniture definitions
 FURNITURE_NAMES = {
     4: "Torch", 33: "Candle", 49: "Water Candle", 372: "Peace Candle",
@@ -55,6 +72,26 @@ COLOR_RANGES = {
     'white': [(0, 360, 0, 20, 80, 100)],
 }
 
+# COLOR_RANGES frozen into one flat (Nranges, 6) table at import - one row per
+# range (red has two), plus the index of the color each row belongs to
+COLOR_NAMES = list(COLOR_RANGES)
+_FLAT_RANGES = [(i, r) for i, ranges in enumerate(COLOR_RANGES.values()) for r in ranges]
+COLOR_IDX = np.array([i for i, _ in _FLAT_RANGES], dtype=np.intp)
+COLOR_BOUNDS = np.array([r for _, r in _FLAT_RANGES], dtype=np.int16)
+for _table in (COLOR_IDX, COLOR_BOUNDS):
+    _table.flags.writeable = False
+H_MIN, H_MAX, S_MIN, S_MAX, V_MIN, V_MAX = COLOR_BOUNDS.T
+# Start offset of each color's ranges, for collapsing ranges back into colors
+_COLOR_STARTS = np.searchsorted(COLOR_IDX, np.arange(len(COLOR_NAMES)))
+
+CLASSIFY_CHUNK = 4096
+
+# Record layout of Image.getcolors() entries: (count, (r, g, b, a))
+HISTOGRAM_DTYPE = np.dtype([('count', np.int64), ('rgba', np.uint8, (4,))])
+
+# Cached color tags are only valid for the ranges they were computed with
+COLOR_RANGES_KEY = hashlib.blake2b(json.dumps(COLOR_RANGES).encode(), digest_size=8).hexdigest()
+
 # Category keywords
 CATEGORY_KEYWORDS = {
     'chair': ['chair', 'throne', 'seat', 'stool'],
@@ -90,111 +127,225 @@ CATEGORY_KEYWORDS = {
     'space': ['meteor', 'lunar', 'martian', 'nebula', 'solar', 'stardust', 'vortex'],
 }
 
+# One automaton for all keywords. Some keywords belong to several categories
+# (crystal, coral, palm, boreal) so each keyword maps to a tuple of categories.
+KEYWORD_AUTOMATON = None
+if ahocorasick is not None:
+    _keyword_categories = {}
+    for _category, _keywords in CATEGORY_KEYWORDS.items():
+        for _keyword in _keywords:
+            _keyword_categories.setdefault(_keyword, []).append(_category)
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _categories in _keyword_categories.items():
+        KEYWORD_AUTOMATON.add_word(_keyword, tuple(_categories))
+    KEYWORD_AUTOMATON.make_automaton()
+
 
-def rgb_to_hsv(r, g, b):
-    """Convert RGB (0-255) to HSV (H: 0-360, S: 0-100, V: 0-100)."""
-    r, g, b = r / 255.0, g / 255.0, b / 255.0
-    max_c = max(r, g, b)
-    min_c = min(r, g, b)
+def rgb_to_hsv_array(rgb):
+    """Convert an (N, 3) uint8 RGB array to HSV arrays (H: 0-360, S: 0-100, V: 0-100)."""
+    rgb = rgb.astype(np.float64) / 255.0
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    max_c = rgb.max(axis=1)
+    min_c = rgb.min(axis=1)
     diff = max_c - min_c
     
     # Value
     v = max_c * 100
     
-    # Saturation
-    if max_c == 0:
-        s = 0
-    else:
-        s = (diff / max_c) * 100
-    
-    # Hue
-    if diff == 0:
-        h = 0
-    elif max_c == r:
-        h = (60 * ((g - b) / diff) + 360) % 360
-    elif max_c == g:
-        h = (60 * ((b - r) / diff) + 120) % 360
-    else:
-        h = (60 * ((r - g) / diff) + 240) % 360
+    # Saturation (guard the division, black pixels get 0)
+    s = np.where(max_c > 0, diff / np.maximum(max_c, 1e-9) * 100, 0.0)
+    
+    # Hue - select the sector's channel difference and offset, then do the
+    # divide/scale/wrap once for the whole array instead of once per branch.
+    # Gray pixels (diff == 0) get 0.
+    is_r, is_g = max_c == r, max_c == g
+    num = np.select([is_r, is_g], [g - b, b - r], default=r - g)
+    offset = np.select([is_r, is_g], [360.0, 120.0], default=240.0)
+    safe_diff = np.where(diff > 0, diff, 1.0)
+    h = (60 * (num / safe_diff) + offset) % 360
+    h[diff == 0] = 0.0
     
     return h, s, v
 
 
-def get_color_from_hsv(h, s, v):
-    """Determine color name(s) from HSV values."""
-    colors = []
+def get_color_counts_from_hsv(h, s, v, weights=None):
+    """Vectorized color classification: count matching pixels per color.
     
-    for color_name, ranges in COLOR_RANGES.items():
-        for h_min, h_max, s_min, s_max, v_min, v_max in ranges:
-            if h_min <= h <= h_max and s_min <= s <= s_max and v_min <= v <= v_max:
-                colors.append(color_name)
-                break
+    Takes flat H/S/V arrays and returns (counts, first) int64 arrays indexed
+    like COLOR_NAMES: the number of matching pixels, and the index of the first
+    entry that matched (len(h) for colors that never matched).
+    A pixel counts at most once per color, even if it falls in several ranges.
+    If weights is given, each entry counts as that many pixels (palette counts).
+    """
+    counts = np.zeros(len(COLOR_NAMES), dtype=np.int64)
+    first = np.full(len(COLOR_NAMES), len(h), dtype=np.int64)
+    
+    # Chunked so the (pixels x ranges) temporary stays small
+    for start in range(0, len(h), CLASSIFY_CHUNK):
+        hc = h[start:start + CLASSIFY_CHUNK, None]
+        sc = s[start:start + CLASSIFY_CHUNK, None]
+        vc = v[start:start + CLASSIFY_CHUNK, None]
+        match = ((hc >= H_MIN) & (hc <= H_MAX) &
+                 (sc >= S_MIN) & (sc <= S_MAX) &
+                 (vc >= V_MIN) & (vc <= V_MAX))
+        per_color = np.logical_or.reduceat(match, _COLOR_STARTS, axis=1)
+        if weights is None:
+            counts += per_color.sum(axis=0)
+        else:
+            counts += weights[start:start + CLASSIFY_CHUNK] @ per_color
+        seen = per_color.any(axis=0) & (first == len(h))
+        first[seen] = start + per_color[:, seen].argmax(axis=0)
     
-    return colors
+    return counts, first
+
+
+def first_pixel_order(img, rgba):
+    """Order of the (N, 4) colors rgba by where each first appears in img (raster order)."""
+    pixels = np.asarray(img).reshape(-1, 4).view(np.uint32).ravel()
+    keys = np.ascontiguousarray(rgba).view(np.uint32).ravel()
+    uniq, first = np.unique(pixels, return_index=True)
+    return np.argsort(first[np.searchsorted(uniq, keys)])
 
 
 def analyze_image_colors(img):
     """Analyze an image and return dominant colors with percentages."""
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
+    # Always work on a copy - thumbnail() below resizes in place
+    img = img.convert('RGBA')
+    
+    # Crop away the transparent border (getbbox looks at alpha for RGBA) so
+    # sparse sprites don't spend the sample budget on empty space
+    bbox = img.getbbox()
+    if bbox is None:
+        return []
+    img = img.crop(bbox)
     
-    # Sample pixels for speed - resize large images
+    # Sample pixels for speed - shrink large images to ~100x100 max
     w, h = img.size
     if w * h > 10000:
-        # Downsample to ~100x100 max
-        scale = min(100 / w, 100 / h, 1.0)
-        if scale < 1.0:
-            img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.NEAREST)
-    
-    pixels = list(img.getdata())
-    color_counts = Counter()
-    total_opaque = 0
-    
-    for pixel in pixels:
-        if len(pixel) < 4:
-            r, g, b = pixel[:3]
-            a = 255
-        else:
-            r, g, b, a = pixel
-        
-        # Skip transparent pixels
-        if a < 128:
-            continue
-        
-        total_opaque += 1
-        h, s, v = rgb_to_hsv(r, g, b)
-        colors = get_color_from_hsv(h, s, v)
-        
-        for color in colors:
-            color_counts[color] += 1
+        img.thumbnail((100, 100), Image.NEAREST, reducing_gap=None)
+    
+    # Terraria textures use small palettes - let PIL build the color histogram
+    # in C, then classify each distinct color once weighted by its pixel count.
+    # maxcolors = pixel count, so getcolors() can never give up and return None.
+    w, h = img.size
+    histogram = img.getcolors(maxcolors=w * h)
+    colors = np.fromiter(histogram, dtype=HISTOGRAM_DTYPE, count=len(histogram))
+    
+    # Skip transparent pixels before doing any color math
+    colors = colors[colors['rgba'][:, 3] >= 128]
+    weights = colors['count']
+    total_opaque = int(weights.sum())
     
     if total_opaque == 0:
         return []
     
-    # Return colors that make up at least 10% of opaque pixels
-    significant_colors = []
-    for color, count in color_counts.most_common():
-        percentage = (count / total_opaque) * 100
-        if percentage >= 10:
-            significant_colors.append(color)
-        if len(significant_colors) >= 3:  # Max 3 color tags
-            break
+    palette_rgb = colors['rgba'][:, :3]
+    
+    hue, sat, val = rgb_to_hsv_array(palette_rgb)
+    counts, _ = get_color_counts_from_hsv(hue, sat, val, weights)
+    
+    # Colors that make up at least 10% of opaque pixels, most common first
+    order = np.argsort(-counts, kind='stable')
+    percentage = (counts[order] / total_opaque) * 100
+    significant = order[percentage >= 10]
     
-    return significant_colors
+    if len(np.unique(counts[significant])) < len(significant):
+        # Equal counts: Counter.most_common() (filled pixel by pixel) lists the
+        # color seen first in the image first, and within one pixel follows
+        # COLOR_RANGES order. Redo the classification with the palette in
+        # order of appearance to find where each color is first seen.
+        by_first = first_pixel_order(img, colors['rgba'])
+        _, first = get_color_counts_from_hsv(hue[by_first], sat[by_first], val[by_first])
+        significant = np.lexsort((first, -counts))[:len(significant)]
+    
+    return [COLOR_NAMES[i] for i in significant[:3]]  # Max 3 color tags
 
 
-def extract_category_tags(name):
-    """Extract category tags from item name."""
-    tags = set()
-    name_lower = name.lower()
+@lru_cache(maxsize=None)
+def _category_tags_for(name_lower):
+    """Category tags for an already-lowercased name, cached per unique name."""
+    if KEYWORD_AUTOMATON is not None:
+        # Single pass over the name finds every keyword at once
+        return tuple({category for _, categories in KEYWORD_AUTOMATON.iter(name_lower)
+                      for category in categories})
     
+    tags = set()
     for category, keywords in CATEGORY_KEYWORDS.items():
         for keyword in keywords:
             if keyword in name_lower:
                 tags.add(category)
                 break
     
-    return list(tags)
+    return tuple(tags)
+
+
+def extract_category_tags(name):
+    """Extract category tags from item name."""
+    return list(_category_tags_for(name.lower()))
+
+
+def load_color_cache():
+    """Load {content hash: color tags} from the last run, or {} if stale/missing."""
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cache, dict) or cache.get('ranges') != COLOR_RANGES_KEY:
+        return {}
+    return cache.get('colors', {})
+
+
+def save_color_cache(color_cache):
+    """Write the color cache next to tile_tags.json."""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'ranges': COLOR_RANGES_KEY, 'colors': color_cache}, f)
+    except OSError as e:
+        print(f"  Could not write cache: {e}")
+
+
+# Per-worker copy of the color cache, set once by the pool initializer
+_color_cache = {}
+
+
+def _init_worker(color_cache):
+    global _color_cache
+    _color_cache = color_cache
+
+
+def _analyze_one(path, kind, item_id, name):
+    """Analyze a single texture file. Runs in a worker process.
+    
+    Returns (kind, id_str, record, error, digest) - errors are passed back
+    instead of raised so one bad file doesn't abort the whole pool.
+    """
+    digest = None
+    try:
+        # Read the file once - the same bytes feed the hash and the decoder
+        data = path.read_bytes()
+        
+        # Unchanged files reuse their color tags from the previous run
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        color_tags = _color_cache.get(digest)
+        if color_tags is None:
+            img = Image.open(io.BytesIO(data))
+            color_tags = analyze_image_colors(img)
+        category_tags = extract_category_tags(name)
+        
+        # Sorted so regenerating tile_tags.json gives stable diffs
+        all_tags = sorted({*color_tags, *category_tags})
+        
+        record = {
+            'name': name,
+            'colors': color_tags,
+            'categories': category_tags,
+            'tags': all_tags
+        }
+        return kind, str(item_id), record, None, digest
+    except Exception as e:
+        return kind, str(item_id), None, f"Error processing {path.name}: {e}", digest
 
 
 def analyze_all_textures():
@@ -207,72 +358,61 @@ def analyze_all_textures():
         'furniture': {}
     }
     
-    # Analyze tiles (blocks and furniture)
+    # Collect work items: (path, kind, id, name)
+    tasks = []
+    
+    # Tiles (blocks and furniture)
     tile_files = sorted(TEXTURE_DIR.glob("Tiles_*.png"))
-    for i, path in enumerate(tile_files):
-        match = re.match(r'Tiles_(\d+)\.png', path.name)
-        if not match:
+    for path in tile_files:
+        id_str = path.stem[len('Tiles_'):]
+        if not (id_str.isascii() and id_str.isdigit()):
             continue
         
-        tid = int(match.group(1))
+        tid = int(id_str)
         
         # Get name
         if tid in FURNITURE_NAMES:
-            name = FURNITURE_NAMES[tid]
-            item_type = 'furniture'
+            tasks.append((path, 'furniture', tid, FURNITURE_NAMES[tid]))
         else:
-            name = TILE_NAMES.get(tid, f"Tile {tid}")
-            item_type = 'blocks'
-        
-        try:
-            img = Image.open(path)
-            color_tags = analyze_image_colors(img)
-            category_tags = extract_category_tags(name)
-            
-            all_tags = list(set(color_tags + category_tags))
-            
-            results[item_type][str(tid)] = {
-                'name': name,
-                'colors': color_tags,
-                'categories': category_tags,
-                'tags': all_tags
-            }
-            
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i + 1}/{len(tile_files)} tiles...")
-                
-        except Exception as e:
-            print(f"  Error processing {path.name}: {e}")
+            tasks.append((path, 'blocks', tid, TILE_NAMES.get(tid, f"Tile {tid}")))
+    num_tiles = len(tasks)
     
-    # Analyze walls
+    # Walls
     wall_files = sorted(TEXTURE_DIR.glob("Wall_*.png"))
-    for i, path in enumerate(wall_files):
-        match = re.match(r'Wall_(\d+)\.png', path.name)
-        if not match:
+    for path in wall_files:
+        id_str = path.stem[len('Wall_'):]
+        if not (id_str.isascii() and id_str.isdigit()):
             continue
         
-        wid = int(match.group(1))
-        name = WALL_NAMES.get(wid, f"Wall {wid}")
-        
-        try:
-            img = Image.open(path)
-            color_tags = analyze_image_colors(img)
-            category_tags = extract_category_tags(name)
-            
-            all_tags = list(set(color_tags + category_tags))
-            
-            results['walls'][str(wid)] = {
-                'name': name,
-                'colors': color_tags,
-                'categories': category_tags,
-                'tags': all_tags
-            }
+        wid = int(id_str)
+        tasks.append((path, 'walls', wid, WALL_NAMES.get(wid, f"Wall {wid}")))
+    num_walls = len(tasks) - num_tiles
+    
+    # Each file is independent - spread decode + analysis across processes.
+    # map() yields in submission order so the JSON output order is unchanged.
+    paths, kinds, ids, names = zip(*tasks) if tasks else ((), (), (), ())
+    color_cache = load_color_cache()
+    if color_cache:
+        print(f"  Loaded {len(color_cache)} cached color results")
+    new_cache = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker,
+                             initargs=(color_cache,)) as executor:
+        results_iter = executor.map(_analyze_one, paths, kinds, ids, names, chunksize=16)
+        for i, (kind, id_str, record, error, digest) in enumerate(results_iter):
+            if error:
+                print(f"  {error}")
+            else:
+                results[kind][id_str] = record
+                new_cache[digest] = record['colors']
             
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i + 1}/{len(wall_files)} walls...")
-                
-        except Exception as e:
-            print(f"  Error processing {path.name}: {e}")
+            if i < num_tiles:
+                if (i + 1) % 50 == 0:
+                    print(f"  Processed {i + 1}/{num_tiles} tiles...")
+            elif (i - num_tiles + 1) % 50 == 0:
+                print(f"  Processed {i - num_tiles + 1}/{num_walls} walls...")
+    
+    # Only keep entries for files that still exist
+    save_color_cache(new_cache)
     
     return results
 
@@ -299,8 +439,12 @@ def main():
     print(f"  Walls: {total_walls}")
     
     # Save to JSON
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(results, f, indent=2)
+    if orjson is not None:
+        with open(OUTPUT_FILE, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_FILE, 'w') as f:
+            json.dump(results, f, indent=2)
     
     print(f"\nSaved to: {OUTPUT_FILE}")
     
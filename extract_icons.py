@@ -12,42 +12,54 @@ OUTPUT_SIZE = 32  # Final icon size
 
 
 def remove_background(img):
-    """Remove background by detecting the most common corner color."""
+    """Remove background by detecting the most common corner color.
+    
+    Returns (image, bbox) - bbox is the trimmed content box, None if empty.
+    """
     data = np.array(img)
     
     # Sample corners to detect background color
     h, w = data.shape[:2]
-    corners = [
-        data[0, 0],           # top-left
-        data[0, w-1],         # top-right
-        data[h-1, 0],         # bottom-left
-        data[h-1, w-1],       # bottom-right
-    ]
+    corners = data[[0, 0, h-1, h-1], [0, w-1, 0, w-1]]  # TL, TR, BL, BR
     
-    # Find most common corner color (likely background)
-    from collections import Counter
-    corner_tuples = [tuple(c) for c in corners]
-    bg_color = Counter(corner_tuples).most_common(1)[0][0]
+    # Find most common corner color (likely background), ties go to the
+    # first corner in the order above
+    _, first, counts = np.unique(corners, axis=0, return_index=True, return_counts=True)
+    bg = corners[first[np.lexsort((first, -counts))[0]]]
     
     # Make pixels matching background transparent
     # Allow some tolerance for anti-aliasing
     tolerance = 30
-    bg = np.array(bg_color)
     
-    # Calculate distance from background color
-    diff = np.abs(data[:,:,:3].astype(int) - bg[:3].astype(int))
+    # Calculate distance from background color (int16 is plenty for 0-255
+    # differences and keeps the temporary small)
+    diff = np.abs(data[:,:,:3].astype(np.int16) - bg[:3].astype(np.int16))
     mask = np.all(diff < tolerance, axis=2)
     
     # Set matching pixels to transparent
     data[mask, 3] = 0
     
-    return Image.fromarray(data)
+    return Image.fromarray(data), alpha_bbox(data)
+
+
+def alpha_bbox(data):
+    """Bounding box (left, top, right, bottom) of non-transparent pixels, or None.
+    
+    Same result as Image.getbbox() on an RGBA image, computed on the array.
+    """
+    alpha = data[:, :, 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(alpha.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
 
 
-def center_and_resize(icon, target_size=OUTPUT_SIZE):
+def center_and_resize(icon, target_size=OUTPUT_SIZE, bbox=None):
     """Center the icon content and resize to target, maintaining aspect ratio."""
-    # Trim transparent edges
-    bbox = icon.getbbox()
+    # Trim transparent edges (bbox may be passed in if already known)
+    if bbox is None:
+        bbox = icon.getbbox()
     if not bbox:
         # Fully transparent, return empty
         return Image.new('RGBA', (target_size, target_size), (0, 0, 0, 0))
@@ -108,10 +120,10 @@ def extract_icons(spritesheet_path):
             icon = img.crop((x, y, x + icon_w, y + icon_h))
             
             # Remove background
-            icon = remove_background(icon)
+            icon, bbox = remove_background(icon)
             
             # Center and resize
-            icon = center_and_resize(icon, OUTPUT_SIZE)
+            icon = center_and_resize(icon, OUTPUT_SIZE, bbox)
             
             name = icon_names[row][col]
             icon.save(ICONS_DIR / f"{name}.png")
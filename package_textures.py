@@ -28,8 +28,9 @@ def package_textures():
     
     print(f"Found {len(tiles)} tiles and {len(walls)} walls")
     
-    # Create zip file
-    with zipfile.ZipFile(OUTPUT_FILE, 'w', zipfile.ZIP_DEFLATED) as zf:
+    # Create zip file - PNGs are already deflate-compressed, so store them
+    # as-is instead of running zlib over them a second time
+    with zipfile.ZipFile(OUTPUT_FILE, 'w', zipfile.ZIP_STORED) as zf:
         for f in tiles:
             # Store just the filename, not full path
             zf.write(f, f.name)
@@ -9,12 +9,18 @@ from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
 import re
 import os
 
 
 TEXTURE_DIR = Path(__file__).parent / "textures"
 TILE_SIZE = 16
+TILE_CACHE_SIZE = 4096  # Max cached zoomed cell tiles (LRU)
+VIEW_OVERSCAN = 0.25  # Fraction of the viewport also rendered on each side
+LIST_ROW_HEIGHT = 30  # Pixel pitch of rows in the item lists
+GRID_COLOR = '#1e1e2e'  # Subtle grid lines
+GRID_RGBA = (30, 30, 46, 255)  # GRID_COLOR as framebuffer pixels
 
 # Import data
 try:
@@ -50,6 +56,105 @@ TILE_FRAME_MAP = {
     0b1110: [(3, 1)], 0b1101: [(0, 1)], 0b1011: [(1, 2)], 0b1111: [(1, 1)],
 }
 
+# (col, row) frame for each of the 16 neighbor masks, indexed by mask
+FRAME_LUT = np.array([TILE_FRAME_MAP[mask][0] for mask in range(16)], dtype=np.int8)
+MASK_ALL = 0b1111  # Neighbors on every side (center tile)
+
+# Image.point table for RGBA: color bands unchanged, alpha halved (cursor ghosts)
+GHOST_LUT = list(range(256)) * 3 + [a // 2 for a in range(256)]
+# Same for the selection being moved, at 70% opacity
+MOVE_LUT = list(range(256)) * 3 + [int(a * 0.7) for a in range(256)]
+
+
+def neighbor_masks(solid):
+    """Auto-tile bitmask for every cell of a boolean array of solid blocks.
+    
+    Bits are n=1, e=2, s=4, w=8, matching TILE_FRAME_MAP.
+    """
+    solid = solid.astype(np.uint8)
+    mask = np.zeros(solid.shape, dtype=np.uint8)
+    mask[1:, :] |= solid[:-1, :]
+    mask[:, :-1] |= solid[:, 1:] << 1
+    mask[:-1, :] |= solid[1:, :] << 2
+    mask[:, 1:] |= solid[:, :-1] << 3
+    return mask
+
+
+def crop_array(arr, x, y, w, h):
+    """Region of an RGBA sheet array as an image, transparent outside the sheet (like Image.crop)."""
+    tile = arr[y:y+h, x:x+w]
+    if tile.shape[:2] != (h, w):
+        padded = np.zeros((h, w, 4), dtype=np.uint8)
+        padded[:tile.shape[0], :tile.shape[1]] = tile
+        tile = padded
+    return Image.fromarray(tile, 'RGBA')
+
+
+def resize_nearest(img, size):
+    """Square nearest-neighbor resize of an RGBA image, returned as an array.
+    
+    Whole-number upscales are done with np.repeat, which is a plain copy, and
+    whole-number downscales with a strided slice (sampling the same pixels
+    as PIL's NEAREST, i.e. the middle of each step).
+    """
+    if img.width == img.height:
+        k, rem = divmod(size, img.width)
+        if rem == 0:
+            arr = np.asarray(img)
+            return arr if k == 1 else arr.repeat(k, axis=0).repeat(k, axis=1)
+        if size and img.width % size == 0:
+            step = img.width // size
+            return np.ascontiguousarray(np.asarray(img)[step // 2::step, step // 2::step])
+    return np.asarray(img.resize((size, size), Image.NEAREST))
+
+
+def scale_nearest(img, zoom):
+    """Nearest-neighbor resize of an RGBA image by a zoom factor.
+    
+    The result is int(width * zoom) x int(height * zoom). As in resize_nearest,
+    whole-number scales are done in NumPy instead of PIL.
+    """
+    w, h = int(img.width * zoom), int(img.height * zoom)
+    if (w, h) == img.size:
+        return img
+    k, rem = divmod(w, img.width)
+    if rem == 0 and h == img.height * k:
+        return Image.fromarray(np.asarray(img).repeat(k, axis=0).repeat(k, axis=1), 'RGBA')
+    if w and img.width % w == 0:
+        step = img.width // w
+        if h * step == img.height:
+            return Image.fromarray(np.ascontiguousarray(np.asarray(img)[step // 2::step, step // 2::step]), 'RGBA')
+    return img.resize((w, h), Image.NEAREST)
+
+
+def extract_block_frames(sheet):
+    """Slice the auto-tile frames out of an RGBA block sheet.
+    
+    Returns a contiguous (16, 16, 16, 4) uint8 array indexed by neighbor mask.
+    """
+    arr = np.asarray(sheet)
+    sh, sw = arr.shape[:2]
+    if sh < 17 or sw < 17:
+        # Tiny sheet - pad with transparency like an out-of-bounds crop
+        arr = np.pad(arr, ((0, max(0, 17 - sh)), (0, max(0, 17 - sw)), (0, 0)))
+    frames = np.empty((16, 16, 16, 4), dtype=np.uint8)
+    for mask, (col, row) in enumerate(FRAME_LUT.tolist()):
+        x, y = col * 18 + 1, row * 18 + 1
+        if x + 16 > sw: x = 1
+        if y + 16 > sh: y = 1
+        frames[mask] = arr[y:y+16, x:x+16]
+    return frames
+
+def read_sheet(path):
+    """Decode a texture sheet to an RGBA array (None if missing or unreadable)."""
+    if not path.exists():
+        return None
+    try:
+        with Image.open(path) as img:
+            return np.asarray(img.convert('RGBA'))
+    except Exception:
+        return None
+
 # Furniture definitions: tile_id -> (name, tile_width, tile_height, frame_pixel_w, frame_pixel_h)
 # These are multi-tile objects that don't auto-tile
 FURNITURE = {
@@ -178,14 +283,24 @@ FURNITURE = {
     92: ("Lamp Post", 1, 6, 18, 108),
 }
 
+# Furniture footprint in tiles: tile_id -> (tile_width, tile_height)
+FURNITURE_SIZE = {tid: (info[1], info[2]) for tid, info in FURNITURE.items()}
+
+
+TILE_FILE_RE = re.compile(r'Tiles_(\d+)\.png')
+WALL_FILE_RE = re.compile(r'Wall_(\d+)\.png')
+
 
 def scan_textures():
     tiles, walls = [], []
-    for f in TEXTURE_DIR.iterdir():
-        if m := re.match(r'Tiles_(\d+)\.png', f.name):
-            tiles.append(int(m.group(1)))
-        elif m := re.match(r'Wall_(\d+)\.png', f.name):
-            walls.append(int(m.group(1)))
+    # scandir hands back names straight from the directory listing (no Path objects)
+    with os.scandir(TEXTURE_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if m := TILE_FILE_RE.match(name):
+                tiles.append(int(m.group(1)))
+            elif m := WALL_FILE_RE.match(name):
+                walls.append(int(m.group(1)))
     return sorted(tiles), sorted(walls)
 
 
@@ -386,8 +501,9 @@ def score_search_match(search_terms, item_name, item_tags):
 
 class TileCache:
     def __init__(self, tile_ids, wall_ids):
-        self.sheets = {}
-        self.cache = {}
+        self.sheets = {}  # Sheet key -> texture Path until first use (see _get_sheet), dropped once cut up
+        self.frames = {}  # Block tile id -> frame atlas from extract_block_frames
+        self.cache = {}  # Decoded tiles; every get_* image is RGBA
         self.tile_info = {}
         self.wall_info = {}
         self.furniture_info = {}
@@ -395,12 +511,14 @@ class TileCache:
         self._load(tile_ids, wall_ids)
     
     def _load(self, tile_ids, wall_ids):
+        # Sheets are only decoded when first drawn - here we just note the paths
         for tid in tile_ids:
             path = TEXTURE_DIR / f"Tiles_{tid}.png"
             if path.exists():
                 try:
-                    self.sheets[('t', tid)] = Image.open(path).convert('RGBA')
+                    Image.open(path).close()  # Header check only
                     if tid in FURNITURE:
+                        self.sheets[('t', tid)] = path
                         name = FURNITURE[tid][0]
                         rgb = TILE_COLORS.get(tid, (128,128,128))
                         self.furniture_info[tid] = (name, rgb)
@@ -411,6 +529,8 @@ class TileCache:
                         else:
                             self.item_tags[('furniture', tid)] = generate_item_tags(name, rgb)
                     else:
+                        # Blocks only ever need their auto-tile frames (see _get_frames)
+                        self.sheets[('b', tid)] = path
                         name = TILE_NAMES.get(tid, f"Tile {tid}")
                         rgb = TILE_COLORS.get(tid, (128,128,128))
                         self.tile_info[tid] = (name, rgb)
@@ -426,7 +546,8 @@ class TileCache:
             path = TEXTURE_DIR / f"Wall_{wid}.png"
             if path.exists():
                 try:
-                    self.sheets[('w', wid)] = Image.open(path).convert('RGBA')
+                    Image.open(path).close()  # Header check only
+                    self.sheets[('w', wid)] = path
                     name = WALL_NAMES.get(wid, f"Wall {wid}")
                     rgb = WALL_COLORS.get(wid, (80,80,80))
                     self.wall_info[wid] = (name, rgb)
@@ -440,61 +561,68 @@ class TileCache:
         
         print(f"Loaded {len(self.tile_info)} blocks, {len(self.furniture_info)} furniture, {len(self.wall_info)} walls")
     
+    def _get_sheet(self, key):
+        """RGBA array for a sheet key, decoding it on first use (None if unavailable)."""
+        sheet = self.sheets.get(key)
+        if isinstance(sheet, Path):
+            sheet = self.sheets[key] = read_sheet(sheet)
+        return sheet
+    
+    def _get_frames(self, tid):
+        """Auto-tile frame atlas for a block, extracted on first use."""
+        if tid not in self.frames:
+            sheet = self._get_sheet(('b', tid))
+            self.frames[tid] = extract_block_frames(sheet) if sheet is not None else None
+            # The atlas is all we keep of a block sheet
+            self.sheets.pop(('b', tid), None)
+        return self.frames[tid]
+    
     def get_tags(self, item_type, item_id):
         """Get tags for an item."""
         return self.item_tags.get((item_type, item_id), [])
     
-    def get_block(self, tid, neighbors):
-        if ('t', tid) not in self.sheets:
-            return None
+    def get_block(self, tid, mask):
+        """Block tile for a neighbor bitmask (see neighbor_masks)."""
+        key = ('b', tid, mask)
+        if key in self.cache:
+            return self.cache[key]
         if tid in FURNITURE:
             return self.get_furniture(tid)
+        frames = self._get_frames(tid)
+        if frames is None:
+            return None
         
-        # Convert bool to int for bitmask
-        n = 1 if neighbors.get('n') else 0
-        e = 1 if neighbors.get('e') else 0
-        s = 1 if neighbors.get('s') else 0
-        w = 1 if neighbors.get('w') else 0
-        mask = (n << 0) | (e << 1) | (s << 2) | (w << 3)
-        
-        col, row = TILE_FRAME_MAP.get(mask, [(1,1)])[0]
-        
-        key = ('b', tid, col, row)
-        if key not in self.cache:
-            sheet = self.sheets[('t', tid)]
-            sw, sh = sheet.size
-            x, y = col * 18 + 1, row * 18 + 1
-            if x + 16 > sw: x = 1
-            if y + 16 > sh: y = 1
-            self.cache[key] = sheet.crop((x, y, x+16, y+16))
+        self.cache[key] = Image.fromarray(frames[mask])
         return self.cache[key]
     
     def get_furniture(self, tid):
         key = ('f', tid)
         if key not in self.cache:
-            sheet = self.sheets.get(('t', tid))
-            if not sheet:
+            sheet = self._get_sheet(('t', tid))
+            if sheet is None:
                 return None
             info = FURNITURE.get(tid)
             if info:
                 _, tw, th, fw, fh = info
-                # Extract first frame, scale to fit grid size
-                frame = sheet.crop((0, 0, min(fw, sheet.width), min(fh, sheet.height)))
+                # Extract first frame (clipped to the sheet), scale to fit grid size
+                frame = Image.fromarray(sheet[:fh, :fw], 'RGBA')
                 # Scale to tile grid size
                 target_w, target_h = tw * 16, th * 16
                 frame = frame.resize((target_w, target_h), Image.NEAREST)
                 self.cache[key] = frame
             else:
-                self.cache[key] = sheet.crop((0, 0, 16, 16))
+                self.cache[key] = crop_array(sheet, 0, 0, 16, 16)
+            # Nothing else is cut from a furniture sheet
+            self.sheets.pop(('t', tid), None)
         return self.cache[key]
     
     def get_wall(self, wid, neighbors=None):
         key = ('w', wid, 'tile')
         if key not in self.cache:
-            sheet = self.sheets.get(('w', wid))
-            if not sheet:
+            sheet = self._get_sheet(('w', wid))
+            if sheet is None:
                 return None
-            w, h = sheet.size
+            h, w = sheet.shape[:2]
             # Use solid center frame
             fx, fy = 9 * 36, 3 * 36
             if fx + 36 > w: fx = 0
@@ -502,10 +630,14 @@ class TileCache:
             x, y = fx + 10, fy + 10
             if x + 16 > w: x = fx + 2
             if y + 16 > h: y = fy + 2
-            frame = sheet.crop((x, y, x+16, y+16))
-            if np.array(frame)[:,:,3].sum() < 128 * 256:
-                frame = sheet.crop((fx+2, fy+2, fx+34, fy+34)).resize((16,16), Image.NEAREST)
+            # Mostly transparent (mean alpha < 128) - use the whole frame instead
+            if sheet[y:y+16, x:x+16, 3].sum() < 128 * 256:
+                frame = crop_array(sheet, fx+2, fy+2, 32, 32).resize((16,16), Image.NEAREST)
+            else:
+                frame = crop_array(sheet, x, y, 16, 16)
             self.cache[key] = frame
+            # The one tile is all we keep of a wall sheet
+            self.sheets.pop(('w', wid), None)
         return self.cache[key]
 
 
@@ -515,11 +647,10 @@ class TerrariaPaint:
         self.root.title("TPaint - Terraria Builder")
         self.root.configure(bg='#1e1e2e')
         
-        # Grid - now uses layered cells: {'wall': wall_id or None, 'block': block_data or None}
-        # block_data can be ('block', tile_id) or ('furn', tile_id, fx, fy)
+        # Grid - layered cells stored as NumPy arrays (see GRID STORAGE below)
         # Default large canvas (256x160 tiles = 4096x2560 pixels) for expansive builds
         self.cols, self.rows = 256, 160
-        self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
+        self._alloc_grid()
         
         # State
         self.tool = 'block'
@@ -527,7 +658,29 @@ class TerrariaPaint:
         self.block_id = 30
         self.wall_id = 4
         self.brush = 1
-        self.photos = {}
+        self.previews = {}  # (item_type, tid) -> list preview PhotoImage
+        self.swatches = {}  # rgb -> color swatch PhotoImage for items without a preview
+        self.ghost_photos = {}  # (kind, id, zoom) -> semi-transparent cursor preview PhotoImage
+        self.cell_tiles = OrderedDict()  # Cell key -> zoomed RGBA tile array, see _cell_key
+        
+        # Framebuffer - the visible cells are drawn into one RGBA array that
+        # is shown through a single PhotoImage (see _render_view)
+        self.framebuffer = None
+        self.fb_view = None  # (r0, c0, r1, c1) cells covered by the framebuffer
+        self.fb_photo = None
+        self.fb_item = None
+        self.fb_job = None  # Pending idle blit
+        self.fb_dirty = None  # (r0, c0, r1, c1) cells changed since the last blit
+        self.fb_patch = None  # Staging PhotoImage for dirty-rect blits, reused while the size holds
+        self.empty_tile = None  # What an empty cell shows in the framebuffer (grid lines or nothing)
+        self.view_job = None  # Pending idle view update after scrolling
+        self.render_job = None  # Pending idle full render (zoom, undo/redo)
+        self.preview_job = None  # Pending idle cursor/drag preview
+        self.preview_cell = None  # (draw, row, col) for preview_job
+        self.cursor_sig = None  # What the cursor items currently show
+        self.cursor_rects = []  # Pooled cursor outline / ghost image items (see _show_cursor)
+        self.cursor_images = []
+        self.cursor_shown = (0, 0)  # How many of each pool are visible
         self.search_job = None
         self.zoom = 1.0  # Zoom level (0.25 to 4.0)
         
@@ -542,6 +695,8 @@ class TerrariaPaint:
         self.moving = False  # Whether currently moving a selection
         self.move_start = None  # (row, col) where move started
         self.move_data = None  # Grid data being moved
+        self.move_photo = None  # Composed preview of move_data, see _move_preview_photo
+        self.move_photo_key = None
         
         # Undo/Redo system
         self.undo_stack = []  # List of grid states
@@ -675,14 +830,14 @@ class TerrariaPaint:
         self.zoom = max(0.25, min(4.0, self.zoom * factor))
         scaled_size = int(TILE_SIZE * self.zoom)
         self.canvas.config(scrollregion=(0, 0, self.cols * scaled_size, self.rows * scaled_size))
-        self._render()
+        self._schedule_render()
     
     def _reset_zoom(self):
         """Reset zoom to 100%."""
         self.zoom = 1.0
         scaled_size = int(TILE_SIZE * self.zoom)
         self.canvas.config(scrollregion=(0, 0, self.cols * scaled_size, self.rows * scaled_size))
-        self._render()
+        self._schedule_render()
     
     def _show_shortcuts(self):
         """Show keyboard shortcuts dialog."""
@@ -944,7 +1099,7 @@ NAVIGATION:
         all_search_entry = ttk.Entry(all_frame, textvariable=self.all_search, font=('Segoe UI', 10))
         all_search_entry.pack(fill=tk.X, padx=4, pady=6)
         
-        self.all_list = self._create_list(all_frame)
+        self.all_list = self._create_list(all_frame, show_type=True)
         self._populate_all()
         
         # Blocks tab
@@ -990,7 +1145,8 @@ NAVIGATION:
         yscroll = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL)
         
         self.canvas = tk.Canvas(canvas_frame, bg='#010409', highlightthickness=0,
-                               xscrollcommand=xscroll.set, yscrollcommand=yscroll.set,
+                               xscrollcommand=lambda *a: self._on_scroll(xscroll, *a),
+                               yscrollcommand=lambda *a: self._on_scroll(yscroll, *a),
                                scrollregion=(0, 0, self.cols*TILE_SIZE, self.rows*TILE_SIZE))
         
         xscroll.config(command=self.canvas.xview)
@@ -1006,13 +1162,13 @@ NAVIGATION:
         self.canvas.bind('<Button-3>', self._right_click)
         self.canvas.bind('<B3-Motion>', self._right_drag)
         self.canvas.bind('<Motion>', self._hover)
-        self.canvas.bind('<Leave>', lambda e: self.canvas.delete('cursor'))
+        self.canvas.bind('<Leave>', self._leave)
+        self.canvas.bind('<Configure>', lambda e: self._schedule_view_update())
         
         # Middle-click pan
         self.canvas.bind('<Button-2>', self._pan_start)
         self.canvas.bind('<B2-Motion>', self._pan_move)
         self.canvas.bind('<ButtonRelease-2>', self._pan_end)
-        self._pan_data = None
         
         # Scroll wheel zoom
         self.canvas.bind('<MouseWheel>', self._zoom)
@@ -1026,26 +1182,166 @@ NAVIGATION:
         tk.Label(status_frame, textvariable=self.status, bg=bg_mid, fg=text_dim, 
                 font=('Segoe UI', 9), anchor='w', padx=10).pack(fill=tk.BOTH, expand=True)
     
-    def _create_list(self, parent):
+    def _create_list(self, parent, show_type=False):
+        """Create a virtualized item list.
+        
+        Only a small pool of row widgets exists; scrolling re-points them at
+        the items in view (see _refresh_list). show_type adds the item type
+        icon column used by the All tab.
+        """
         frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True)
         
         bg = self.colors['bg_mid']
         canvas = tk.Canvas(frame, bg=bg, highlightthickness=0, bd=0)
         scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=canvas.yview)
-        inner = tk.Frame(canvas, bg=bg)
         
-        canvas.configure(yscrollcommand=scroll.set)
+        lst = {'canvas': canvas, 'items': [], 'rows': [], 'show_type': show_type}
+        
+        canvas.configure(yscrollcommand=lambda *a: self._list_scrolled(lst, scroll, *a))
         scroll.pack(side=tk.RIGHT, fill=tk.Y)
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        win = canvas.create_window((0,0), window=inner, anchor='nw')
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(win, width=e.width))
-        inner.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
+        canvas.bind('<Configure>', lambda e: self._refresh_list(lst))
         canvas.bind('<MouseWheel>', lambda e: canvas.yview_scroll(-1*(e.delta//120), 'units'))
-        inner.bind('<MouseWheel>', lambda e: canvas.yview_scroll(-1*(e.delta//120), 'units'))
         
-        return {'canvas': canvas, 'inner': inner, 'photos': []}
+        return lst
+    
+    def _create_list_row(self, lst):
+        """Create one pooled row widget for a virtualized list."""
+        canvas = lst['canvas']
+        bg_mid = self.colors['bg_mid']
+        bg_light = self.colors['bg_light']
+        text = self.colors['text']
+        text_dim = self.colors['text_dim']
+        accent = self.colors['accent']
+        
+        row = {'item': None}
+        frame = tk.Frame(canvas, bg=bg_mid)
+        
+        # Type indicator
+        if lst['show_type']:
+            row['type'] = tk.Label(frame, bg=bg_mid, fg=text_dim, font=('Segoe UI', 10), width=2)
+            row['type'].pack(side=tk.LEFT)
+        
+        # Texture preview (24x24)
+        preview_frame = tk.Frame(frame, bg=bg_mid, width=28, height=28)
+        preview_frame.pack(side=tk.LEFT, padx=(0,6))
+        preview_frame.pack_propagate(False)
+        row['preview'] = tk.Label(preview_frame, bg=bg_mid, bd=0)
+        row['preview'].place(relx=0.5, rely=0.5, anchor='center')
+        
+        # Name button
+        btn = tk.Button(frame, anchor='w',
+                       bg=bg_mid, fg=text, activebackground=accent, activeforeground='#ffffff',
+                       bd=0, padx=8, pady=4, font=('Segoe UI', 9),
+                       cursor='hand2',
+                       command=lambda: self._select_item(row['item'][1], row['item'][0]))
+        btn.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        row['btn'] = btn
+        
+        # Hover effects
+        btn.bind('<Enter>', lambda e: btn.config(bg=bg_light))
+        btn.bind('<Leave>', lambda e: btn.config(bg=bg_mid))
+        
+        # Bind mousewheel
+        for w in (frame, preview_frame, row['preview'], btn):
+            w.bind('<MouseWheel>', lambda e: canvas.yview_scroll(-1*(e.delta//120), 'units'))
+        
+        row['win'] = canvas.create_window(4, 0, window=frame, anchor='nw', height=LIST_ROW_HEIGHT - 2)
+        return row
+    
+    def _set_list_items(self, lst, items):
+        """Show items, a list of (item_type, tid, name, rgb), in a virtualized list."""
+        lst['items'] = items
+        canvas = lst['canvas']
+        canvas.configure(scrollregion=(0, 0, 0, len(items) * LIST_ROW_HEIGHT))
+        canvas.yview_moveto(0)
+        self._refresh_list(lst)
+    
+    def _list_scrolled(self, lst, scroll, first, last):
+        """List canvas scroll callback - update the scrollbar and the rows in view."""
+        scroll.set(first, last)
+        self._refresh_list(lst)
+    
+    def _refresh_list(self, lst):
+        """Point the pooled row widgets at the items currently in view."""
+        canvas = lst['canvas']
+        items = lst['items']
+        
+        # Enough rows to cover the visible height
+        needed = canvas.winfo_height() // LIST_ROW_HEIGHT + 2
+        while len(lst['rows']) < needed:
+            lst['rows'].append(self._create_list_row(lst))
+        
+        first = max(0, int(canvas.canvasy(0)) // LIST_ROW_HEIGHT)
+        width = max(1, canvas.winfo_width() - 8)
+        name_len = 20 if lst['show_type'] else 22
+        
+        for i, row in enumerate(lst['rows']):
+            idx = first + i
+            if idx >= len(items):
+                row['item'] = None
+                canvas.itemconfig(row['win'], state='hidden')
+                continue
+            
+            item_type, tid, name, rgb = items[idx]
+            canvas.coords(row['win'], 4, idx * LIST_ROW_HEIGHT + 1)
+            canvas.itemconfig(row['win'], width=width, state='normal')
+            if row['item'] == (item_type, tid):
+                continue
+            row['item'] = (item_type, tid)
+            
+            if lst['show_type']:
+                row['type'].config(text='🪑' if item_type == 'furniture' else '🧱')
+            
+            # Texture preview, or fallback to color swatch
+            row['preview'].config(image=self._item_preview(item_type, tid) or self._swatch(rgb))
+            
+            row['btn'].config(text=f"{tid}: {name[:name_len]}")
+    
+    def _swatch(self, rgb):
+        """20x20 solid color PhotoImage, shared by every row with that color."""
+        rgb = tuple(rgb)
+        if rgb not in self.swatches:
+            self.swatches[rgb] = ImageTk.PhotoImage(Image.new('RGB', (20, 20), rgb))
+        return self.swatches[rgb]
+    
+    def _item_preview(self, item_type, tid):
+        """24x24 texture preview PhotoImage for a list item, or None (cached)."""
+        key = (item_type, tid)
+        if key in self.previews:
+            return self.previews[key]
+        
+        preview_img = None
+        try:
+            if item_type == 'wall':
+                tile = self.cache.get_wall(tid)
+            elif item_type == 'furniture':
+                tile = self.cache.get_furniture(tid)
+            else:
+                # For blocks, get center tile (all neighbors)
+                tile = self.cache.get_block(tid, MASK_ALL)
+            
+            if tile:
+                # Scale to 24x24
+                tw, th = tile.size
+                scale = min(24 / tw, 24 / th)
+                new_w = max(1, int(tw * scale))
+                new_h = max(1, int(th * scale))
+                scaled = tile.resize((new_w, new_h), Image.NEAREST)
+                
+                # Center on 24x24 canvas
+                preview = Image.new('RGBA', (24, 24), (0, 0, 0, 0))
+                x = (24 - new_w) // 2
+                y = (24 - new_h) // 2
+                preview.paste(scaled, (x, y), scaled)
+                preview_img = ImageTk.PhotoImage(preview)
+        except:
+            pass
+        
+        self.previews[key] = preview_img
+        return preview_img
     
     def _populate_blocks(self, filter_text=""):
         self._populate_list(self.block_list, self.cache.tile_info, filter_text, 'block')
@@ -1071,17 +1367,6 @@ NAVIGATION:
     
     def _populate_combined_list(self, lst, data, filter_text):
         """Populate a list with combined item types."""
-        inner = lst['inner']
-        for w in inner.winfo_children():
-            w.destroy()
-        lst['photos'].clear()
-        
-        bg_mid = self.colors['bg_mid']
-        bg_light = self.colors['bg_light']
-        text = self.colors['text']
-        text_dim = self.colors['text_dim']
-        accent = self.colors['accent']
-        
         # Parse search terms
         search_terms = filter_text.lower().split() if filter_text else []
         
@@ -1102,92 +1387,10 @@ NAVIGATION:
         # Sort by score (highest first), then by name
         scored_items.sort(key=lambda x: (-x[4], x[2].lower()))
         
-        # Limit to 200 items for performance when not searching
-        if not search_terms and len(scored_items) > 200:
-            scored_items = scored_items[:200]
-            # Add "search to see more" hint
-            hint = tk.Label(inner, text=f"Showing 200 of {len(data)} items. Search to filter.",
-                           bg=bg_mid, fg=text_dim, font=('Segoe UI', 9, 'italic'))
-            hint.pack(fill=tk.X, pady=4, padx=4)
-        
-        for item_type, tid, name, rgb, score in scored_items:
-            row = tk.Frame(inner, bg=bg_mid)
-            row.pack(fill=tk.X, pady=1, padx=4)
-            
-            # Type indicator
-            type_label = tk.Label(row, text=name[:1], bg=bg_mid, fg=text_dim, 
-                                 font=('Segoe UI', 10), width=2)
-            type_label.pack(side=tk.LEFT)
-            
-            # Texture preview (24x24)
-            preview_frame = tk.Frame(row, bg=bg_mid, width=28, height=28)
-            preview_frame.pack(side=tk.LEFT, padx=(0,6))
-            preview_frame.pack_propagate(False)
-            
-            preview_img = None
-            try:
-                if item_type == 'wall':
-                    tile = self.cache.get_wall(tid)
-                elif item_type == 'furniture':
-                    tile = self.cache.get_furniture(tid)
-                else:
-                    tile = self.cache.get_block(tid, {'n': True, 'e': True, 's': True, 'w': True})
-                
-                if tile:
-                    tw, th = tile.size
-                    scale = min(24 / tw, 24 / th)
-                    new_w = max(1, int(tw * scale))
-                    new_h = max(1, int(th * scale))
-                    scaled = tile.resize((new_w, new_h), Image.NEAREST)
-                    
-                    preview = Image.new('RGBA', (24, 24), (0, 0, 0, 0))
-                    x = (24 - new_w) // 2
-                    y = (24 - new_h) // 2
-                    preview.paste(scaled, (x, y), scaled)
-                    preview_img = ImageTk.PhotoImage(preview)
-            except:
-                pass
-            
-            if preview_img:
-                lst['photos'].append(preview_img)
-                lbl = tk.Label(preview_frame, image=preview_img, bg=bg_mid)
-                lbl.pack(expand=True)
-            else:
-                color = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                swatch = tk.Frame(preview_frame, bg=color, width=20, height=20)
-                swatch.pack(expand=True, pady=2)
-            
-            # Name button (without emoji)
-            display_name = name[2:] if name[0] in '🧱🪑' else name
-            display = f"{tid}: {display_name[:20]}"
-            btn = tk.Button(row, text=display, anchor='w',
-                           bg=bg_mid, fg=text, activebackground=accent, activeforeground='#ffffff',
-                           bd=0, padx=8, pady=4, font=('Segoe UI', 9),
-                           cursor='hand2',
-                           command=lambda t=tid, it=item_type: self._select_item(t, it))
-            btn.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-            def on_enter(e, b=btn): b.config(bg=bg_light)
-            def on_leave(e, b=btn): b.config(bg=bg_mid)
-            btn.bind('<Enter>', on_enter)
-            btn.bind('<Leave>', on_leave)
-            btn.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-            preview_frame.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-            row.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-        
-        inner.update_idletasks()
+        self._set_list_items(lst, [(item_type, tid, name[2:] if name[0] in '🧱🪑' else name, rgb)
+                                   for item_type, tid, name, rgb, score in scored_items])
 
     def _populate_list(self, lst, data, filter_text, item_type):
-        inner = lst['inner']
-        for w in inner.winfo_children():
-            w.destroy()
-        lst['photos'].clear()
-        
-        bg_mid = self.colors['bg_mid']
-        bg_light = self.colors['bg_light']
-        text = self.colors['text']
-        accent = self.colors['accent']
-        
         # Parse search terms
         search_terms = filter_text.lower().split() if filter_text else []
         
@@ -1207,74 +1410,7 @@ NAVIGATION:
         # Sort by score (highest first), then by name
         scored_items.sort(key=lambda x: (-x[3], x[1].lower()))
         
-        for tid, name, rgb, score in scored_items:
-            row = tk.Frame(inner, bg=bg_mid)
-            row.pack(fill=tk.X, pady=1, padx=4)
-            
-            # Texture preview (24x24)
-            preview_frame = tk.Frame(row, bg=bg_mid, width=28, height=28)
-            preview_frame.pack(side=tk.LEFT, padx=(0,6))
-            preview_frame.pack_propagate(False)
-            
-            # Try to get actual texture
-            preview_img = None
-            try:
-                if item_type == 'wall':
-                    tile = self.cache.get_wall(tid)
-                elif item_type == 'furniture':
-                    tile = self.cache.get_furniture(tid)
-                else:
-                    # For blocks, get center tile (all neighbors)
-                    tile = self.cache.get_block(tid, {'n': True, 'e': True, 's': True, 'w': True})
-                
-                if tile:
-                    # Scale to 24x24
-                    tw, th = tile.size
-                    scale = min(24 / tw, 24 / th)
-                    new_w = max(1, int(tw * scale))
-                    new_h = max(1, int(th * scale))
-                    scaled = tile.resize((new_w, new_h), Image.NEAREST)
-                    
-                    # Center on 24x24 canvas
-                    preview = Image.new('RGBA', (24, 24), (0, 0, 0, 0))
-                    x = (24 - new_w) // 2
-                    y = (24 - new_h) // 2
-                    preview.paste(scaled, (x, y), scaled)
-                    preview_img = ImageTk.PhotoImage(preview)
-            except:
-                pass
-            
-            if preview_img:
-                lst['photos'].append(preview_img)  # Keep reference
-                lbl = tk.Label(preview_frame, image=preview_img, bg=bg_mid)
-                lbl.pack(expand=True)
-            else:
-                # Fallback to color swatch
-                color = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                swatch = tk.Frame(preview_frame, bg=color, width=20, height=20)
-                swatch.pack(expand=True, pady=2)
-            
-            # Name button
-            display = f"{tid}: {name[:22]}"
-            btn = tk.Button(row, text=display, anchor='w',
-                           bg=bg_mid, fg=text, activebackground=accent, activeforeground='#ffffff',
-                           bd=0, padx=8, pady=4, font=('Segoe UI', 9),
-                           cursor='hand2',
-                           command=lambda t=tid, it=item_type: self._select_item(t, it))
-            btn.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-            # Hover effects
-            def on_enter(e, b=btn): b.config(bg=bg_light)
-            def on_leave(e, b=btn): b.config(bg=bg_mid)
-            btn.bind('<Enter>', on_enter)
-            btn.bind('<Leave>', on_leave)
-            
-            # Bind mousewheel
-            btn.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-            preview_frame.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-            row.bind('<MouseWheel>', lambda e, c=lst['canvas']: c.yview_scroll(-1*(e.delta//120), 'units'))
-        
-        inner.update_idletasks()
+        self._set_list_items(lst, [(item_type, tid, name, rgb) for tid, name, rgb, score in scored_items])
     
     def _select_item(self, tid, item_type):
         if item_type == 'wall':
@@ -1381,8 +1517,8 @@ NAVIGATION:
                 for ci, cell_data in enumerate(row_data):
                     r, c = sel['r1'] + ri, sel['c1'] + ci
                     if 0 <= r < self.rows and 0 <= c < self.cols:
-                        self.grid[r][c] = cell_data.copy()
-                        self._render_cell(r, c)
+                        self._set_cell_data(r, c, cell_data)
+            self._render_region(sel['r1'] - 1, sel['c1'] - 1, sel['r2'] + 2, sel['c2'] + 2)
         
         self.tool_start = None
         self.tool_preview = []
@@ -1456,13 +1592,7 @@ NAVIGATION:
         new_rows = max(1, min(10000, new_rows))
         
         # Create new grid and copy existing data
-        new_grid = [[{'wall': None, 'block': None} for _ in range(new_cols)] for _ in range(new_rows)]
-        for r in range(min(self.rows, new_rows)):
-            for c in range(min(self.cols, new_cols)):
-                new_grid[r][c] = self.grid[r][c].copy()
-        
-        self.cols, self.rows = new_cols, new_rows
-        self.grid = new_grid
+        self._resize_grid_arrays(new_rows, new_cols)
         scaled_size = int(TILE_SIZE * self.zoom)
         self.canvas.config(scrollregion=(0, 0, self.cols*scaled_size, self.rows*scaled_size))
         self._render()
@@ -1470,42 +1600,15 @@ NAVIGATION:
     
     def _pan_start(self, e):
         """Start middle-click pan."""
-        self._pan_data = (e.x, e.y)
+        self.canvas.scan_mark(e.x, e.y)
         self.canvas.config(cursor='fleur')
     
     def _pan_move(self, e):
-        """Handle middle-click pan drag."""
-        if self._pan_data:
-            dx = e.x - self._pan_data[0]
-            dy = e.y - self._pan_data[1]
-            self._pan_data = (e.x, e.y)
-            
-            # Get current scroll position and canvas size
-            x1, x2 = self.canvas.xview()
-            y1, y2 = self.canvas.yview()
-            
-            # Calculate scroll region size
-            scaled_size = int(TILE_SIZE * self.zoom)
-            total_w = self.cols * scaled_size
-            total_h = self.rows * scaled_size
-            
-            # Sensitivity factor (0.3 = 30% of normal speed)
-            sensitivity = 0.3
-            
-            # Convert pixel delta to fraction of scroll region
-            if total_w > 0:
-                frac_x = (dx * sensitivity) / total_w
-                new_x = max(0, min(1 - (x2 - x1), x1 - frac_x))
-                self.canvas.xview_moveto(new_x)
-            
-            if total_h > 0:
-                frac_y = (dy * sensitivity) / total_h
-                new_y = max(0, min(1 - (y2 - y1), y1 - frac_y))
-                self.canvas.yview_moveto(new_y)
+        """Handle middle-click pan drag - the grid follows the mouse pixel for pixel."""
+        self.canvas.scan_dragto(e.x, e.y, gain=1)
     
     def _pan_end(self, e):
         """End middle-click pan."""
-        self._pan_data = None
         self.canvas.config(cursor='')
     
     def _zoom(self, e):
@@ -1526,8 +1629,8 @@ NAVIGATION:
         scaled_size = int(TILE_SIZE * self.zoom)
         self.canvas.config(scrollregion=(0, 0, self.cols * scaled_size, self.rows * scaled_size))
         
-        # Re-render at new zoom
-        self._render()
+        # Re-render at new zoom (once per idle, however many wheel events arrive)
+        self._schedule_render()
         
         # Try to keep mouse position centered on same grid location
         new_cx = cx * (self.zoom / old_zoom)
@@ -1588,14 +1691,15 @@ NAVIGATION:
         
         if self.tool in ('block', 'wall', 'erase'):
             self._paint(r, c)
-            self._draw_cursor(r, c)
+            self._schedule_preview(self._draw_cursor, r, c)
         elif self.tool == 'select' and self.moving:
-            self._preview_move(r, c)
+            self._schedule_preview(self._preview_move, r, c)
         elif self.tool in ('line', 'circle', 'rect', 'select') and self.tool_start:
-            self._preview_shape(r, c)
+            self._schedule_preview(self._preview_shape, r, c)
     
     def _release(self, e):
         """Handle mouse button release for drag-based tools."""
+        self._cancel_preview()
         r, c = self._get_cell(e)
         if r is None:
             return
@@ -1619,19 +1723,39 @@ NAVIGATION:
         r, c = self._get_cell(e)
         if r is not None:
             self._erase(r, c)
-            self._draw_cursor(r, c)
+            self._schedule_preview(self._draw_cursor, r, c)
     
     def _hover(self, e):
         r, c = self._get_cell(e)
         if r is not None:
-            self._draw_cursor(r, c)
+            self._schedule_preview(self._draw_cursor, r, c)
+    
+    def _schedule_preview(self, draw, r, c):
+        """Call draw(r, c) once the event queue drains.
+        
+        Motion events arrive far faster than a preview can be drawn, so only
+        the latest request is kept and a single idle callback draws it.
+        """
+        self.preview_cell = (draw, r, c)
+        if self.preview_job is None:
+            self.preview_job = self.root.after_idle(self._flush_preview)
+    
+    def _cancel_preview(self):
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+            self.preview_job = None
+    
+    def _flush_preview(self):
+        self.preview_job = None
+        draw, r, c = self.preview_cell
+        draw(r, c)
     
     def _get_furniture_origin(self, row, col, tid):
         """Get top-left position for centered furniture placement."""
-        if tid not in FURNITURE:
+        size = FURNITURE_SIZE.get(tid)
+        if size is None:
             return row, col
-        info = FURNITURE[tid]
-        tw, th = info[1], info[2]
+        tw, th = size
         # Center the furniture on cursor
         origin_r = row - th // 2
         origin_c = col - tw // 2
@@ -1639,33 +1763,36 @@ NAVIGATION:
     
     def _can_place_furniture(self, row, col, tid):
         """Check if furniture can be placed without overlapping other blocks."""
-        if tid not in FURNITURE:
+        size = FURNITURE_SIZE.get(tid)
+        if size is None:
             # For regular blocks, allow placement (blocks can go on walls)
             return True
-        info = FURNITURE[tid]
-        tw, th = info[1], info[2]
+        tw, th = size
         origin_r, origin_c = self._get_furniture_origin(row, col, tid)
         
-        for fr in range(th):
-            for fc in range(tw):
-                nr, nc = origin_r + fr, origin_c + fc
-                if not (0 <= nr < self.rows and 0 <= nc < self.cols):
-                    return False
-                # Check only the block layer - walls are OK to have underneath
-                if self.grid[nr][nc]['block'] is not None:
-                    return False
-        return True
+        if origin_r < 0 or origin_c < 0 or origin_r + th > self.rows or origin_c + tw > self.cols:
+            return False
+        # Check only the block layer - walls are OK to have underneath
+        return not (self.blocks[origin_r:origin_r + th, origin_c:origin_c + tw] >= 0).any()
+    
+    def _leave(self, e):
+        self._show_cursor([], [])
+        self.cursor_sig = None
     
     def _draw_cursor(self, row, col):
-        self.canvas.delete('cursor')
-        self.canvas.delete('preview')
+        # Wiggling inside one cell would redraw the exact same items
+        sig = (row, col, self.tool, self.brush, self.block_id, self.wall_id, self.zoom)
+        if sig == self.cursor_sig:
+            return
+        self.cursor_sig = sig
         
         scaled_size = int(TILE_SIZE * self.zoom)
+        rects = []  # ((x0, y0, x1, y1), outline, width)
+        images = []  # (x, y, photo)
         
         # For furniture, show ghost preview centered on cursor
-        if self.tool == 'block' and self.block_id in FURNITURE:
-            info = FURNITURE[self.block_id]
-            tw, th = info[1], info[2]
+        if self.tool == 'block' and self.block_id in FURNITURE_SIZE:
+            tw, th = FURNITURE_SIZE[self.block_id]
             origin_r, origin_c = self._get_furniture_origin(row, col, self.block_id)
             
             # Check if placement is valid
@@ -1678,24 +1805,12 @@ NAVIGATION:
                     nr, nc = origin_r + fr, origin_c + fc
                     if 0 <= nr < self.rows and 0 <= nc < self.cols:
                         x, y = nc * scaled_size, nr * scaled_size
-                        self.canvas.create_rectangle(x, y, x+scaled_size, y+scaled_size,
-                                                    outline=outline_color, width=2, tags='cursor')
+                        rects.append(((x, y, x+scaled_size, y+scaled_size), outline_color, 2))
             
             # Draw semi-transparent preview image
-            preview_img = self.cache.get_furniture(self.block_id)
-            if preview_img:
-                # Create semi-transparent version
-                preview = preview_img.copy()
-                alpha = preview.split()[3]
-                alpha = alpha.point(lambda p: p * 0.5)  # 50% opacity
-                preview.putalpha(alpha)
-                if self.zoom != 1.0:
-                    new_size = (int(preview.width * self.zoom), int(preview.height * self.zoom))
-                    preview = preview.resize(new_size, Image.NEAREST)
-                photo = ImageTk.PhotoImage(preview)
-                self.photos['preview'] = photo
-                px, py = origin_c * scaled_size, origin_r * scaled_size
-                self.canvas.create_image(px, py, anchor=tk.NW, image=photo, tags='preview')
+            photo = self._ghost_photo('furniture', self.block_id)
+            if photo:
+                images.append((origin_c * scaled_size, origin_r * scaled_size, photo))
         
         elif self.tool == 'block':
             # Show ghost preview for regular blocks too
@@ -1706,21 +1821,11 @@ NAVIGATION:
                     if 0 <= r < self.rows and 0 <= c < self.cols:
                         x, y = c * scaled_size, r * scaled_size
                         # Draw green outline
-                        self.canvas.create_rectangle(x, y, x+scaled_size, y+scaled_size,
-                                                    outline='#00ff00', width=1, tags='cursor')
+                        rects.append(((x, y, x+scaled_size, y+scaled_size), '#00ff00', 1))
                         # Draw preview tile
-                        preview_img = self.cache.get_block(self.block_id, {'n': False, 's': False, 'e': False, 'w': False})
-                        if preview_img:
-                            preview = preview_img.copy()
-                            alpha = preview.split()[3]
-                            alpha = alpha.point(lambda p: int(p * 0.5))
-                            preview.putalpha(alpha)
-                            if self.zoom != 1.0:
-                                new_size = (int(preview.width * self.zoom), int(preview.height * self.zoom))
-                                preview = preview.resize(new_size, Image.NEAREST)
-                            photo = ImageTk.PhotoImage(preview)
-                            self.photos[('preview', r, c)] = photo
-                            self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags='preview')
+                        photo = self._ghost_photo('block', self.block_id)
+                        if photo:
+                            images.append((x, y, photo))
         
         elif self.tool == 'wall':
             # Show ghost preview for walls
@@ -1730,20 +1835,10 @@ NAVIGATION:
                     r, c = row + dr, col + dc
                     if 0 <= r < self.rows and 0 <= c < self.cols:
                         x, y = c * scaled_size, r * scaled_size
-                        self.canvas.create_rectangle(x, y, x+scaled_size, y+scaled_size,
-                                                    outline='#4488ff', width=1, tags='cursor')
-                        preview_img = self.cache.get_wall(self.wall_id)
-                        if preview_img:
-                            preview = preview_img.copy()
-                            alpha = preview.split()[3]
-                            alpha = alpha.point(lambda p: int(p * 0.5))
-                            preview.putalpha(alpha)
-                            if self.zoom != 1.0:
-                                new_size = (int(preview.width * self.zoom), int(preview.height * self.zoom))
-                                preview = preview.resize(new_size, Image.NEAREST)
-                            photo = ImageTk.PhotoImage(preview)
-                            self.photos[('preview', r, c)] = photo
-                            self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags='preview')
+                        rects.append(((x, y, x+scaled_size, y+scaled_size), '#4488ff', 1))
+                        photo = self._ghost_photo('wall', self.wall_id)
+                        if photo:
+                            images.append((x, y, photo))
         
         else:
             # Erase cursor - color depends on erase type
@@ -1760,13 +1855,63 @@ NAVIGATION:
                     r, c = row + dr, col + dc
                     if 0 <= r < self.rows and 0 <= c < self.cols:
                         x, y = c * scaled_size, r * scaled_size
-                        self.canvas.create_rectangle(x+1, y+1, x+scaled_size-1, y+scaled_size-1,
-                                                    outline=outline_color, width=1, tags='cursor')
+                        rects.append(((x+1, y+1, x+scaled_size-1, y+scaled_size-1), outline_color, 1))
+        
+        self._show_cursor(rects, images)
     
-    def _paint(self, row, col):
-        half = self.brush // 2
-        affected = set()
+    def _show_cursor(self, rects, images):
+        """Show cursor outlines and ghost images on pooled canvas items.
         
+        Items are created the first time the pool is too small and afterwards
+        only moved and reconfigured; surplus ones are hidden, not deleted.
+        """
+        created = False
+        for i, (xy, outline, width) in enumerate(rects):
+            if i == len(self.cursor_rects):
+                self.cursor_rects.append(self.canvas.create_rectangle(*xy, tags='cursor'))
+                created = True
+            else:
+                self.canvas.coords(self.cursor_rects[i], *xy)
+            self.canvas.itemconfig(self.cursor_rects[i], outline=outline, width=width, state='normal')
+        for i, (x, y, photo) in enumerate(images):
+            if i == len(self.cursor_images):
+                self.cursor_images.append(self.canvas.create_image(x, y, anchor=tk.NW, tags='preview'))
+                created = True
+            else:
+                self.canvas.coords(self.cursor_images[i], x, y)
+            self.canvas.itemconfig(self.cursor_images[i], image=photo, state='normal')
+        
+        # Hide whatever the last call showed beyond what is needed now
+        shown_rects, shown_images = self.cursor_shown
+        for item in self.cursor_rects[len(rects):shown_rects]:
+            self.canvas.itemconfig(item, state='hidden')
+        for item in self.cursor_images[len(images):shown_images]:
+            self.canvas.itemconfig(item, state='hidden')
+        self.cursor_shown = (len(rects), len(images))
+        
+        if created and self.cursor_images:
+            # Outlines stay above the ghost images they frame
+            self.canvas.tag_raise('cursor', 'preview')
+    
+    def _ghost_photo(self, kind, obj_id):
+        """Semi-transparent cursor preview of a block, wall or furniture (cached per zoom)."""
+        key = (kind, obj_id, self.zoom)
+        if key not in self.ghost_photos:
+            if kind == 'furniture':
+                img = self.cache.get_furniture(obj_id)
+            elif kind == 'wall':
+                img = self.cache.get_wall(obj_id)
+            else:
+                img = self.cache.get_block(obj_id, 0)
+            photo = None
+            if img:
+                # 50% opacity
+                preview = scale_nearest(img.point(GHOST_LUT), self.zoom)
+                photo = ImageTk.PhotoImage(preview)
+            self.ghost_photos[key] = photo
+        return self.ghost_photos[key]
+    
+    def _paint(self, row, col):
         # Handle erase tools in paint
         if self.tool in ('erase', 'erase_block', 'erase_wall'):
             self._erase(row, col)
@@ -1777,8 +1922,7 @@ NAVIGATION:
             if not self._can_place_furniture(row, col, self.block_id):
                 return  # Can't place here - blocked by another block (walls are OK)
             
-            info = FURNITURE[self.block_id]
-            tw, th = info[1], info[2]
+            tw, th = FURNITURE_SIZE[self.block_id]
             origin_r, origin_c = self._get_furniture_origin(row, col, self.block_id)
             
             for fr in range(th):
@@ -1786,71 +1930,84 @@ NAVIGATION:
                     nr, nc = origin_r + fr, origin_c + fc
                     if 0 <= nr < self.rows and 0 <= nc < self.cols:
                         # Place furniture in block layer, keep wall layer intact
-                        self.grid[nr][nc]['block'] = ('furn', self.block_id, fc, fr)
-                        affected.add((nr, nc))
+                        self._set_block_data(nr, nc, ('furn', self.block_id, fc, fr))
             
-            for r, c in affected:
-                self._render_cell(r, c)
+            self._render_region(origin_r, origin_c, origin_r + th, origin_c + tw)
             return
         
-        # Normal block/wall painting
-        for dr in range(-half, self.brush - half):
-            for dc in range(-half, self.brush - half):
-                r, c = row + dr, col + dc
-                if 0 <= r < self.rows and 0 <= c < self.cols:
-                    if self.tool == 'block':
-                        # Blocks go in block layer, wall layer stays intact
-                        self.grid[r][c]['block'] = ('block', self.block_id)
-                    elif self.tool == 'wall':
-                        # Walls go in wall layer, block layer stays intact
-                        self.grid[r][c]['wall'] = self.wall_id
-                    
-                    for nr in range(r-1, r+2):
-                        for nc in range(c-1, c+2):
-                            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                                affected.add((nr, nc))
+        # Normal block/wall painting - the brush square is one slice
+        r0, c0, r1, c1 = self._brush_rect(row, col)
+        if r0 >= r1 or c0 >= c1:
+            return
+        before = self._region_state(r0, c0, r1, c1)
+        if self.tool == 'block':
+            # Blocks go in block layer, wall layer stays intact
+            self.blocks[r0:r1, c0:c1] = self.block_id
+            self._drop_furniture(r0, c0, r1, c1)
+        elif self.tool == 'wall':
+            # Walls go in wall layer, block layer stays intact
+            self.walls[r0:r1, c0:c1] = self.wall_id
         
-        for r, c in affected:
-            self._render_cell(r, c)
+        self._render_brush(r0, c0, r1, c1, before)
     
     def _erase(self, row, col):
+        r0, c0, r1, c1 = self._brush_rect(row, col)
+        if r0 >= r1 or c0 >= c1:
+            return
+        before = self._region_state(r0, c0, r1, c1)
+        if self.tool in ('erase', 'erase_block'):
+            # Block layer
+            self.blocks[r0:r1, c0:c1] = -1
+            self._drop_furniture(r0, c0, r1, c1)
+        if self.tool in ('erase', 'erase_wall'):
+            # Wall layer
+            self.walls[r0:r1, c0:c1] = -1
+        
+        self._render_brush(r0, c0, r1, c1, before)
+    
+    def _region_state(self, r0, c0, r1, c1):
+        """Copy of the grid arrays over r0..r1, c0..c1 (end-exclusive)."""
+        return (self.walls[r0:r1, c0:c1].copy(), self.blocks[r0:r1, c0:c1].copy(),
+                self.furn_frames[r0:r1, c0:c1].copy())
+    
+    def _render_brush(self, r0, c0, r1, c1, before):
+        """Redraw a brush square after an edit, given its _region_state from before.
+        
+        Only cells that changed are redrawn, plus the neighbors of cells that
+        gained or lost a block (the only ones whose auto-tile mask changes).
+        Dragging over cells that already hold the brush draws nothing.
+        """
+        walls, blocks, frames = before
+        changed = ((walls != self.walls[r0:r1, c0:c1]) | (blocks != self.blocks[r0:r1, c0:c1]) |
+                   (frames != self.furn_frames[r0:r1, c0:c1]))
+        if not changed.any():
+            return
+        flipped = ((blocks >= 0) & (frames < 0)) != self._solid_blocks(r0, c0, r1, c1)
+        only = np.zeros((r1 - r0 + 2, c1 - c0 + 2), dtype=bool)
+        only[1:-1, 1:-1] = changed
+        only[:-2, 1:-1] |= flipped
+        only[2:, 1:-1] |= flipped
+        only[1:-1, :-2] |= flipped
+        only[1:-1, 2:] |= flipped
+        self._render_region(r0 - 1, c0 - 1, r1 + 1, c1 + 1, only)
+    
+    def _brush_rect(self, row, col):
+        """Cells (r0, c0, r1, c1), end-exclusive, under the brush centred on (row, col)."""
         half = self.brush // 2
-        affected = set()
-        
-        for dr in range(-half, self.brush - half):
-            for dc in range(-half, self.brush - half):
-                r, c = row + dr, col + dc
-                if 0 <= r < self.rows and 0 <= c < self.cols:
-                    if self.tool == 'erase':
-                        # Erase both layers
-                        self.grid[r][c]['wall'] = None
-                        self.grid[r][c]['block'] = None
-                    elif self.tool == 'erase_block':
-                        # Erase only block layer
-                        self.grid[r][c]['block'] = None
-                    elif self.tool == 'erase_wall':
-                        # Erase only wall layer
-                        self.grid[r][c]['wall'] = None
-                    
-                    for nr in range(r-1, r+2):
-                        for nc in range(c-1, c+2):
-                            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                                affected.add((nr, nc))
-        
-        for r, c in affected:
-            self._render_cell(r, c)
+        r0, c0 = max(row - half, 0), max(col - half, 0)
+        r1 = min(row - half + self.brush, self.rows)
+        c1 = min(col - half + self.brush, self.cols)
+        return r0, c0, r1, c1
     
     def _flood_fill(self, row, col):
         """Flood fill tool - fills connected area with same tile."""
         # Get target cell value
-        cell = self.grid[row][col]
-        
         if self.layer == 'block':
-            target = cell['block']
+            target = self._get_block_data(row, col)
             # Fill with current block
             fill_value = ('block', self.block_id) if self.block_id not in FURNITURE else None
         else:
-            target = cell['wall']
+            target = self._get_wall(row, col)
             fill_value = self.wall_id
         
         if fill_value is None:
@@ -1869,8 +2026,7 @@ NAVIGATION:
             if not (0 <= r < self.rows and 0 <= c < self.cols):
                 continue
             
-            cell = self.grid[r][c]
-            current = cell['block'] if self.layer == 'block' else cell['wall']
+            current = self._get_block_data(r, c) if self.layer == 'block' else self._get_wall(r, c)
             
             if current != target:
                 continue
@@ -1879,9 +2035,9 @@ NAVIGATION:
             
             # Fill this cell
             if self.layer == 'block':
-                self.grid[r][c]['block'] = fill_value
+                self._set_block_data(r, c, fill_value)
             else:
-                self.grid[r][c]['wall'] = fill_value
+                self.walls[r, c] = fill_value
             
             affected.add((r, c))
             
@@ -1890,16 +2046,7 @@ NAVIGATION:
                 queue.append((r + dr, c + dc))
         
         # Re-render affected cells and neighbors
-        to_render = set()
-        for r, c in affected:
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        to_render.add((nr, nc))
-        
-        for r, c in to_render:
-            self._render_cell(r, c)
+        self._render_cells(affected)
         
         self.status.set(f"Filled {len(affected)} cells")
     
@@ -1961,22 +2108,13 @@ NAVIGATION:
             if 0 <= r < self.rows and 0 <= c < self.cols:
                 if self.layer == 'block':
                     if self.block_id not in FURNITURE:
-                        self.grid[r][c]['block'] = ('block', self.block_id)
+                        self._set_block_data(r, c, ('block', self.block_id))
                 else:
-                    self.grid[r][c]['wall'] = self.wall_id
+                    self.walls[r, c] = self.wall_id
                 affected.add((r, c))
         
         # Re-render
-        to_render = set()
-        for r, c in affected:
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        to_render.add((nr, nc))
-        
-        for r, c in to_render:
-            self._render_cell(r, c)
+        self._render_cells(affected)
         
         # Reset tool state
         self.tool_start = None
@@ -2100,7 +2238,7 @@ NAVIGATION:
         for r in range(sel['r1'], sel['r2'] + 1):
             row_data = []
             for c in range(sel['c1'], sel['c2'] + 1):
-                row_data.append(self.grid[r][c].copy())
+                row_data.append(self._get_cell_data(r, c))
             self.clipboard.append(row_data)
         
         self.status.set(f"Copied {sel['r2']-sel['r1']+1}x{sel['c2']-sel['c1']+1} area")
@@ -2120,20 +2258,11 @@ NAVIGATION:
             for dc, cell_data in enumerate(row_data):
                 r, c = start_r + dr, start_c + dc
                 if 0 <= r < self.rows and 0 <= c < self.cols:
-                    self.grid[r][c] = cell_data.copy()
+                    self._set_cell_data(r, c, cell_data)
                     affected.add((r, c))
         
         # Re-render
-        to_render = set()
-        for r, c in affected:
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        to_render.add((nr, nc))
-        
-        for r, c in to_render:
-            self._render_cell(r, c)
+        self._render_cells(affected)
         
         self.status.set(f"Pasted {len(self.clipboard)}x{len(self.clipboard[0])} area")
     
@@ -2144,16 +2273,10 @@ NAVIGATION:
             return
         
         sel = self.selection
-        affected = set()
+        self._clear_region(sel['r1'], sel['c1'], sel['r2'], sel['c2'])
         
-        for r in range(sel['r1'], sel['r2'] + 1):
-            for c in range(sel['c1'], sel['c2'] + 1):
-                self.grid[r][c] = {'wall': None, 'block': None}
-                affected.add((r, c))
-        
-        # Re-render
-        for r, c in affected:
-            self._render_cell(r, c)
+        # Re-render, with a border so neighbors re-tile
+        self._render_region(sel['r1'] - 1, sel['c1'] - 1, sel['r2'] + 2, sel['c2'] + 2)
         
         self.canvas.delete('selection')
         self.selection = None
@@ -2177,17 +2300,16 @@ NAVIGATION:
         
         # Copy the selected data
         self.move_data = []
+        self.move_photo_key = None
         for r in range(sel['r1'], sel['r2'] + 1):
             row_data = []
             for c in range(sel['c1'], sel['c2'] + 1):
-                row_data.append(self.grid[r][c].copy())
+                row_data.append(self._get_cell_data(r, c))
             self.move_data.append(row_data)
         
         # Clear the original area
-        for r in range(sel['r1'], sel['r2'] + 1):
-            for c in range(sel['c1'], sel['c2'] + 1):
-                self.grid[r][c] = {'wall': None, 'block': None}
-                self._render_cell(r, c)
+        self._clear_region(sel['r1'], sel['c1'], sel['r2'], sel['c2'])
+        self._render_region(sel['r1'] - 1, sel['c1'] - 1, sel['r2'] + 2, sel['c2'] + 2)
         
         self.status.set("Drag to move selection")
     
@@ -2212,51 +2334,14 @@ NAVIGATION:
         
         scaled_size = int(TILE_SIZE * self.zoom)
         
-        # Draw the actual blocks being moved as a preview
-        for ri, row_data in enumerate(self.move_data):
-            for ci, cell_data in enumerate(row_data):
-                r, c = new_r1 + ri, new_c1 + ci
-                if 0 <= r < self.rows and 0 <= c < self.cols:
-                    x, y = c * scaled_size, r * scaled_size
-                    
-                    # Get wall image
-                    wall_img = None
-                    if cell_data['wall']:
-                        wall_img = self.cache.get_wall(cell_data['wall'])
-                    
-                    # Get block image
-                    block_img = None
-                    if cell_data['block']:
-                        if cell_data['block'][0] == 'block':
-                            block_img = self.cache.get_block(cell_data['block'][1], {'n': False, 's': False, 'e': False, 'w': False})
-                        elif cell_data['block'][0] == 'furn' and cell_data['block'][2] == 0 and cell_data['block'][3] == 0:
-                            block_img = self.cache.get_furniture(cell_data['block'][1])
-                    
-                    # Composite and render
-                    if wall_img or block_img:
-                        if wall_img and block_img:
-                            img = self._composite_layers(wall_img, block_img)
-                        elif wall_img:
-                            img = wall_img
-                        else:
-                            img = block_img
-                        
-                        # Make semi-transparent
-                        if img:
-                            img = img.copy()
-                            if img.mode != 'RGBA':
-                                img = img.convert('RGBA')
-                            alpha = img.split()[3]
-                            alpha = alpha.point(lambda p: int(p * 0.7))
-                            img.putalpha(alpha)
-                            
-                            if self.zoom != 1.0:
-                                new_size = (int(img.width * self.zoom), int(img.height * self.zoom))
-                                img = img.resize(new_size, Image.NEAREST)
-                            
-                            photo = ImageTk.PhotoImage(img)
-                            self.photos[('move_preview', ri, ci)] = photo
-                            self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags='move_preview')
+        # Draw the actual blocks being moved as a preview (the cells that land on the grid)
+        ri0, ci0 = max(0, -new_r1), max(0, -new_c1)
+        ri1 = min(len(self.move_data), self.rows - new_r1)
+        ci1 = min(len(self.move_data[0]), self.cols - new_c1)
+        if ri0 < ri1 and ci0 < ci1:
+            photo = self._move_preview_photo(ri0, ci0, ri1, ci1)
+            x, y = (new_c1 + ci0) * scaled_size, (new_r1 + ri0) * scaled_size
+            self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags='move_preview')
         
         # Draw outline rectangle
         x1 = new_c1 * scaled_size
@@ -2268,6 +2353,55 @@ NAVIGATION:
                                      outline='#f7768e', width=2,
                                      dash=(4, 4), tags='move_preview')
     
+    def _move_preview_photo(self, ri0, ci0, ri1, ci1):
+        """Semi-transparent PhotoImage of move_data rows ri0..ri1, columns ci0..ci1.
+        
+        The cells are composed into one image, rebuilt only when the range or
+        zoom changes (not on every drag step).
+        """
+        key = (ri0, ci0, ri1, ci1, self.zoom)
+        if self.move_photo_key == key:
+            return self.move_photo
+        
+        scaled_size = int(TILE_SIZE * self.zoom)
+        parts = []
+        for ri in range(ri0, ri1):
+            for ci in range(ci0, ci1):
+                cell_data = self.move_data[ri][ci]
+                
+                # Get wall image
+                wall_img = None
+                if cell_data['wall']:
+                    wall_img = self.cache.get_wall(cell_data['wall'])
+                
+                # Get block image
+                block_img = None
+                if cell_data['block']:
+                    if cell_data['block'][0] == 'block':
+                        block_img = self.cache.get_block(cell_data['block'][1], 0)
+                    elif cell_data['block'][0] == 'furn' and cell_data['block'][2] == 0 and cell_data['block'][3] == 0:
+                        block_img = self.cache.get_furniture(cell_data['block'][1])
+                
+                # Composite, make semi-transparent and add to the preview
+                if wall_img and block_img:
+                    img = self._composite_layers(wall_img, block_img)
+                else:
+                    img = wall_img or block_img
+                if img:
+                    img = scale_nearest(img.point(MOVE_LUT), self.zoom)
+                    parts.append(((ci - ci0) * scaled_size, (ri - ri0) * scaled_size, img))
+        
+        # Big enough for furniture reaching past the last row/column
+        w = max([(ci1 - ci0) * scaled_size] + [x + img.width for x, y, img in parts])
+        h = max([(ri1 - ri0) * scaled_size] + [y + img.height for x, y, img in parts])
+        preview = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+        for x, y, img in parts:
+            preview.alpha_composite(img, (x, y))
+        
+        self.move_photo = ImageTk.PhotoImage(preview)
+        self.move_photo_key = key
+        return self.move_photo
+    
     def _complete_move(self, row, col):
         """Complete moving the selection."""
         if not self.moving or not self.move_start or not self.selection or not self.move_data:
@@ -2289,20 +2423,11 @@ NAVIGATION:
             for ci, cell_data in enumerate(row_data):
                 r, c = new_r1 + ri, new_c1 + ci
                 if 0 <= r < self.rows and 0 <= c < self.cols:
-                    self.grid[r][c] = cell_data.copy()
+                    self._set_cell_data(r, c, cell_data)
                     affected.add((r, c))
         
         # Re-render affected cells and neighbors
-        to_render = set()
-        for r, c in affected:
-            for ddr in range(-1, 2):
-                for ddc in range(-1, 2):
-                    nr, nc = r + ddr, c + ddc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        to_render.add((nr, nc))
-        
-        for r, c in to_render:
-            self._render_cell(r, c)
+        self._render_cells(affected)
         
         # Update selection to new position
         self.selection = {
@@ -2329,148 +2454,409 @@ NAVIGATION:
         
         self.status.set(f"Moved selection by ({dc}, {dr})")
     
-    def _get_neighbors(self, row, col, layer):
-        """Get neighbors for auto-tiling. layer is 'block' or 'wall'."""
-        def check(r, c):
-            if 0 <= r < self.rows and 0 <= c < self.cols:
-                if layer == 'block':
-                    cell = self.grid[r][c]['block']
-                    return cell is not None and cell[0] == 'block'
-                elif layer == 'wall':
-                    return self.grid[r][c]['wall'] is not None
-            return False
-        return {'n': check(row-1, col), 's': check(row+1, col),
-                'e': check(row, col+1), 'w': check(row, col-1)}
+    # =========== GRID STORAGE ===========
+    # The grid is kept as parallel NumPy arrays rather than a dict per cell:
+    #   self.walls[r, c]   - wall id, or -1 for no wall (0 also means no wall,
+    #                        see _has_wall)
+    #   self.blocks[r, c]  - tile id (block or furniture), or -1 for empty
+    #   self.furn_frames[r, c] - frame offset fy << 8 | fx of furniture cells,
+    #                            or -1 for walls, plain blocks and empty cells
+    # Cell dicts {'wall': wall_id or None, 'block': block_data or None}, with
+    # block_data ('block', tile_id) or ('furn', tile_id, fx, fy), are still
+    # used for the clipboard, moves and project files.
+    
+    def _alloc_grid(self):
+        """Allocate an empty self.rows x self.cols grid."""
+        self.walls = np.full((self.rows, self.cols), -1, dtype=np.int16)
+        self.blocks = np.full((self.rows, self.cols), -1, dtype=np.int16)
+        self.furn_frames = np.full((self.rows, self.cols), -1, dtype=np.int16)
+    
+    def _resize_grid_arrays(self, new_rows, new_cols):
+        """Resize the grid arrays, keeping the overlapping top-left content."""
+        keep_r, keep_c = min(self.rows, new_rows), min(self.cols, new_cols)
+        walls, blocks, furn_frames = self.walls, self.blocks, self.furn_frames
+        
+        self.rows, self.cols = new_rows, new_cols
+        self._alloc_grid()
+        self.walls[:keep_r, :keep_c] = walls[:keep_r, :keep_c]
+        self.blocks[:keep_r, :keep_c] = blocks[:keep_r, :keep_c]
+        self.furn_frames[:keep_r, :keep_c] = furn_frames[:keep_r, :keep_c]
+    
+    def _get_wall(self, r, c):
+        """Wall id at (r, c), or None."""
+        wid = self.walls[r, c]
+        return int(wid) if wid > 0 else None
+    
+    def _get_block_data(self, r, c):
+        """Block layer at (r, c) as None, ('block', tid) or ('furn', tid, fx, fy)."""
+        tid = self.blocks[r, c]
+        if tid < 0:
+            return None
+        frame = int(self.furn_frames[r, c])
+        if frame < 0:
+            return ('block', int(tid))
+        return ('furn', int(tid), frame & 0xff, frame >> 8)
+    
+    def _set_block_data(self, r, c, block_data):
+        """Set the block layer at (r, c) from None or a block_data tuple/list."""
+        if not block_data:
+            self.blocks[r, c] = -1
+            self.furn_frames[r, c] = -1
+        elif block_data[0] == 'furn':
+            self.blocks[r, c] = block_data[1]
+            self.furn_frames[r, c] = block_data[3] << 8 | block_data[2]
+        else:
+            self.blocks[r, c] = block_data[1]
+            self.furn_frames[r, c] = -1
+    
+    def _get_cell_data(self, r, c):
+        """Cell at (r, c) as a {'wall', 'block'} dict."""
+        return {'wall': self._get_wall(r, c), 'block': self._get_block_data(r, c)}
+    
+    def _set_cell_data(self, r, c, cell_data):
+        """Set both layers at (r, c) from a {'wall', 'block'} dict."""
+        wall = cell_data['wall']
+        self.walls[r, c] = wall if wall is not None else -1
+        self._set_block_data(r, c, cell_data['block'])
+    
+    def _clear_region(self, r1, c1, r2, c2):
+        """Empty both layers in the inclusive rectangle r1..r2, c1..c2."""
+        self.walls[r1:r2 + 1, c1:c2 + 1] = -1
+        self.blocks[r1:r2 + 1, c1:c2 + 1] = -1
+        self.furn_frames[r1:r2 + 1, c1:c2 + 1] = -1
+    
+    def _drop_furniture(self, r0, c0, r1, c1):
+        """Forget furniture frames in the end-exclusive rectangle r0..r1, c0..c1."""
+        self.furn_frames[r0:r1, c0:c1] = -1
+    
+    def _occupied_cells(self):
+        """(row, col) of every cell with a wall or block, in row-major order."""
+        return np.argwhere(self._has_wall() | (self.blocks >= 0)).tolist()
+    
+    def _has_wall(self, r0=0, c0=0, r1=None, c1=None):
+        """Boolean array of cells holding a wall, over rows r0..r1 and columns c0..c1."""
+        r1 = self.rows if r1 is None else r1
+        c1 = self.cols if c1 is None else c1
+        return self.walls[r0:r1, c0:c1] > 0
+    
+    def _solid_blocks(self, r0=0, c0=0, r1=None, c1=None):
+        """Boolean array of cells holding a block (not furniture) for auto-tiling.
+        
+        Covers rows r0..r1 and columns c0..c1 (the whole grid by default).
+        """
+        r1 = self.rows if r1 is None else r1
+        c1 = self.cols if c1 is None else c1
+        return (self.blocks[r0:r1, c0:c1] >= 0) & (self.furn_frames[r0:r1, c0:c1] < 0)
+    
+    def _block_mask(self, row, col):
+        """Auto-tile neighbor bitmask for a single cell (see neighbor_masks)."""
+        r1, c1 = max(row - 1, 0), max(col - 1, 0)
+        window = self._solid_blocks(r1, c1, row + 2, col + 2)
+        return int(neighbor_masks(window)[row - r1, col - c1])
     
     def _composite_on_bg(self, img):
-        """Composite an image onto solid background to remove transparency."""
-        bg = Image.new('RGB', img.size, (17, 17, 27))  # Match canvas bg #11111b
-        if img.mode == 'RGBA':
-            bg.paste(img, (0, 0), img)
-        else:
-            bg.paste(img, (0, 0))
-        return bg
+        """Composite an RGBA image onto solid background to remove transparency."""
+        bg = Image.new('RGBA', img.size, (17, 17, 27, 255))  # Match canvas bg #11111b
+        return Image.alpha_composite(bg, img)
     
     def _composite_layers(self, wall_img, block_img):
-        """Composite block image on top of wall image."""
+        """Composite block image on top of wall image (both RGBA, as TileCache gives them)."""
         if wall_img is None:
             return block_img
         if block_img is None:
             return wall_img
         
-        # Start with wall as base
-        result = wall_img.copy()
-        if result.mode != 'RGBA':
-            result = result.convert('RGBA')
+        # alpha_composite is a proper "over"; paste with a mask would also
+        # blend the alpha channel itself and wash out half-transparent blocks.
+        # Whole furniture images are bigger than the wall tile under them.
+        if wall_img.size == block_img.size:
+            return Image.alpha_composite(wall_img, block_img)
+        size = max(wall_img.width, block_img.width), max(wall_img.height, block_img.height)
+        result = Image.new('RGBA', size, (0, 0, 0, 0))
+        result.alpha_composite(wall_img)
+        result.alpha_composite(block_img)
+        return result
+    
+    def _cell_key(self, row, col, mask=None):
+        """Key describing what a cell shows, or None for an empty cell.
         
-        # Paste block on top
-        if block_img.mode == 'RGBA':
-            result.paste(block_img, (0, 0), block_img)
-        else:
-            result.paste(block_img, (0, 0))
+        Identical cells share one zoomed tile in self.cell_tiles.
+        """
+        wall_id = self._get_wall(row, col)
+        block_data = self._get_block_data(row, col)
         
-        return result
+        block = None
+        if block_data:
+            if block_data[0] == 'block':
+                if mask is None:
+                    mask = self._block_mask(row, col)
+                block = ('b', block_data[1], mask)
+            elif block_data[0] == 'furn':
+                # Each furniture cell shows its own part of the furniture
+                block = block_data
+        
+        if wall_id is None and not block:
+            return None
+        return (wall_id, block, self.zoom)
     
-    def _render_cell(self, row, col):
+    def _cell_tile(self, key):
+        """Zoomed RGBA tile array for a _cell_key, or None if nothing to draw."""
+        if key in self.cell_tiles:
+            self.cell_tiles.move_to_end(key)
+            return self.cell_tiles[key]
+        
+        wall_id, block, zoom = key
+        wall_img = self.cache.get_wall(wall_id) if wall_id else None
+        block_img = None
+        if block and block[0] == 'b':
+            block_img = self.cache.get_block(block[1], block[2])
+        elif block:
+            furn_img = self.cache.get_furniture(block[1])
+            fx, fy = block[2] * TILE_SIZE, block[3] * TILE_SIZE
+            if furn_img and fx < furn_img.width and fy < furn_img.height:
+                block_img = furn_img.crop((fx, fy, fx + TILE_SIZE, fy + TILE_SIZE))
+        
+        tile = None
+        if wall_img or block_img:
+            top = block_img or wall_img
+            if top.getextrema()[3][0] == 255:
+                # Fully opaque top layer - nothing underneath shows through
+                img = top
+            else:
+                # Composite wall and block onto solid background
+                img = self._composite_on_bg(self._composite_layers(wall_img, block_img))
+            tile = resize_nearest(img, int(TILE_SIZE * zoom))
+        
+        self.cell_tiles[key] = tile
+        if len(self.cell_tiles) > TILE_CACHE_SIZE:
+            self.cell_tiles.popitem(last=False)
+        return tile
+    
+    def _draw_cells(self, r0, c0, r1, c1, pick=None):
+        """Write the tiles of cells r0..r1, c0..c1 (end-exclusive, inside fb_view) into the framebuffer.
+        
+        pick, if given, is a boolean array over the rectangle choosing which
+        cells to write.
+        """
+        vr0, vc0, vr1, vc1 = self.fb_view
         scaled_size = int(TILE_SIZE * self.zoom)
-        x, y = col * scaled_size, row * scaled_size
-        self.canvas.delete(f'c_{row}_{col}')
+        fb = self.framebuffer
         
-        cell = self.grid[row][col]
-        wall_id = cell['wall']
-        block_data = cell['block']
+        # Auto-tile masks with a 1-cell border so edge cells see their neighbors
+        pr0, pc0 = max(r0 - 1, 0), max(c0 - 1, 0)
+        solid = self._solid_blocks(pr0, pc0, min(r1 + 1, self.rows), min(c1 + 1, self.cols))
+        masks = neighbor_masks(solid)[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
         
-        if not wall_id and not block_data:
+        if pick is None:
+            cells = [(r, c) for r in range(r1 - r0) for c in range(c1 - c0)] if (r1 - r0) * (c1 - c0) <= 16 else None
+            pick = True  # Broadcasts as "every cell" below
+        else:
+            cells = np.argwhere(pick).tolist() if np.count_nonzero(pick) <= 16 else None
+        if cells is not None:
+            # A brush dab or so - quicker to look the few tiles up one by one
+            for r, c in cells:
+                key = self._cell_key(r0 + r, c0 + c, int(masks[r, c]))
+                tile = self._cell_tile(key) if key else None
+                y, x = (r0 + r - vr0) * scaled_size, (c0 + c - vc0) * scaled_size
+                fb[y:y+scaled_size, x:x+scaled_size] = self.empty_tile if tile is None else tile
             return
         
-        # Get wall image
-        wall_img = None
-        if wall_id:
-            wall_img = self.cache.get_wall(wall_id)
+        # Plain cells are described by one integer (wall id, block id and
+        # mask); each distinct one is looked up once and the tiles are then
+        # scattered into the framebuffer in a single indexing operation.
+        # Furniture cells each show their own frame and are drawn one by one.
+        solid = solid[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
+        walls = self.walls[r0:r1, c0:c1].astype(np.int64)
+        blocks = self.blocks[r0:r1, c0:c1].astype(np.int64)
+        furn = (blocks >= 0) & ~solid
+        codes = np.where(self._has_wall(r0, c0, r1, c1), walls, 0) << 32
+        codes |= np.where(solid, blocks * 16 + masks + 1, 0)
+        rows, cols = np.nonzero(pick & ~furn)
+        if len(rows):
+            uniq, inverse = np.unique(codes[rows, cols], return_inverse=True)
+            atlas = np.empty((len(uniq), scaled_size, scaled_size, 4), dtype=np.uint8)
+            for i, code in enumerate(uniq.tolist()):
+                wall_id, block = code >> 32, (code & 0xffffffff) - 1
+                tile = None
+                if code:
+                    key = (wall_id or None, ('b', block >> 4, block & 15) if block >= 0 else None, self.zoom)
+                    tile = self._cell_tile(key)
+                atlas[i] = self.empty_tile if tile is None else tile
+            cells = fb.reshape(vr1 - vr0, scaled_size, vc1 - vc0, scaled_size, 4)
+            cells[rows + (r0 - vr0), :, cols + (c0 - vc0)] = atlas[inverse]
+        
+        for r, c in np.argwhere(pick & furn).tolist():
+            tile = self._cell_tile(self._cell_key(r0 + r, c0 + c))
+            y, x = (r0 + r - vr0) * scaled_size, (c0 + c - vc0) * scaled_size
+            fb[y:y+scaled_size, x:x+scaled_size] = self.empty_tile if tile is None else tile
+    
+    def _render_region(self, r0, c0, r1, c1, only=None):
+        """Redraw the cells r0..r1, c0..c1 (end-exclusive, clipped to the view).
+        
+        only, if given, is a boolean array over the region picking which cells
+        to redraw. The framebuffer is shown at the next idle blit.
+        """
+        self.cursor_sig = None  # Furniture placement validity may have changed
+        if self.framebuffer is None or self.render_job is not None:
+            # A pending full render (e.g. after a zoom) redraws these cells anyway,
+            # and the framebuffer may still be sized for the old zoom
+            return
+        vr0, vc0, vr1, vc1 = self.fb_view
+        R0, C0, R1, C1 = max(r0, vr0), max(c0, vc0), min(r1, vr1), min(c1, vc1)
+        if R0 >= R1 or C0 >= C1:
+            return
+        pick = None
+        if only is not None:
+            pick = only[R0 - r0:R1 - r0, C0 - c0:C1 - c0]
+            rows, cols = np.nonzero(pick)
+            if not len(rows):
+                return
+            # Trim to the picked cells so the blit copies as little as possible
+            R0, R1, C0, C1 = R0 + int(rows.min()), R0 + int(rows.max()) + 1, C0 + int(cols.min()), C0 + int(cols.max()) + 1
+            pick = only[R0 - r0:R1 - r0, C0 - c0:C1 - c0]
+        self._draw_cells(R0, C0, R1, C1, pick)
+        
+        # Grow the dirty rectangle; the idle blit only copies that part
+        d = self.fb_dirty
+        if d is None:
+            self.fb_dirty = (R0, C0, R1, C1)
+        else:
+            self.fb_dirty = (min(d[0], R0), min(d[1], C0), max(d[2], R1), max(d[3], C1))
         
-        # Get block/furniture image
-        block_img = None
-        if block_data:
-            if block_data[0] == 'block':
-                neighbors = self._get_neighbors(row, col, 'block')
-                block_img = self.cache.get_block(block_data[1], neighbors)
-            elif block_data[0] == 'furn':
-                tid, fx, fy = block_data[1], block_data[2], block_data[3]
-                if fx == 0 and fy == 0:
-                    # Render full furniture from top-left
-                    furn_img = self.cache.get_furniture(tid)
-                    if furn_img:
-                        # Handle wall underneath furniture
-                        if wall_img:
-                            # Create composite with wall as background for entire furniture
-                            info = FURNITURE.get(tid)
-                            if info:
-                                tw, th = info[1], info[2]
-                                # Create background from walls under entire furniture
-                                bg = Image.new('RGBA', (tw * 16, th * 16), (17, 17, 27, 255))
-                                for fr in range(th):
-                                    for fc in range(tw):
-                                        nr, nc = row + fr, col + fc
-                                        if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                                            wcell = self.grid[nr][nc]['wall']
-                                            if wcell:
-                                                wtile = self.cache.get_wall(wcell)
-                                                if wtile:
-                                                    bg.paste(wtile, (fc * 16, fr * 16), wtile)
-                                # Composite furniture on top of wall background
-                                bg.paste(furn_img, (0, 0), furn_img)
-                                img = bg
-                            else:
-                                img = furn_img
-                        else:
-                            img = self._composite_on_bg(furn_img)
-                        
-                        # Scale for zoom
-                        if self.zoom != 1.0:
-                            new_size = (int(img.width * self.zoom), int(img.height * self.zoom))
-                            img = img.resize(new_size, Image.NEAREST)
-                        photo = ImageTk.PhotoImage(img)
-                        self.photos[(row, col)] = photo
-                        self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags=f'c_{row}_{col}')
-                        return
-                else:
-                    # Non-origin furniture cell - don't render (origin handles it)
-                    # But we may need to render the wall underneath
-                    if wall_img:
-                        img = self._composite_on_bg(wall_img)
-                        if self.zoom != 1.0:
-                            new_size = (int(img.width * self.zoom), int(img.height * self.zoom))
-                            img = img.resize(new_size, Image.NEAREST)
-                        photo = ImageTk.PhotoImage(img)
-                        self.photos[(row, col)] = photo
-                        self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags=f'c_{row}_{col}')
-                    return
+        if self.fb_job is None:
+            self.fb_job = self.root.after_idle(self._blit)
+    
+    def _render_cells(self, cells):
+        """Redraw the changed (row, col) cells and their 8 neighbors, each once."""
+        cells = np.array(list(cells), dtype=np.intp).reshape(-1, 2)
+        if not len(cells):
+            return
+        r0, c0 = (cells.min(axis=0) - 1).tolist()
+        r1, c1 = (cells.max(axis=0) + 2).tolist()
+        near = np.zeros((r1 - r0, c1 - c0), dtype=bool)
+        near[cells[:, 0] - r0, cells[:, 1] - c0] = True
+        # Grow by one cell in every direction (diagonals included)
+        near[1:] |= near[:-1].copy()
+        near[:-1] |= near[1:].copy()
+        near[:, 1:] |= near[:, :-1].copy()
+        near[:, :-1] |= near[:, 1:].copy()
+        self._render_region(r0, c0, r1, c1, near)
+    
+    def _visible_window(self, overscan=0):
+        """(r0, c0, r1, c1) range of cells visible in the canvas.
+        
+        overscan widens the range by that fraction of the viewport on each side.
+        """
+        scaled_size = int(TILE_SIZE * self.zoom)
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        x0, y0 = x0 - w * overscan, y0 - h * overscan
+        w, h = w * (1 + 2 * overscan), h * (1 + 2 * overscan)
+        r0 = min(self.rows, max(0, int(y0 // scaled_size)))
+        c0 = min(self.cols, max(0, int(x0 // scaled_size)))
+        r1 = max(r0, min(self.rows, int((y0 + h) // scaled_size) + 1))
+        c1 = max(c0, min(self.cols, int((x0 + w) // scaled_size) + 1))
+        return r0, c0, r1, c1
+    
+    def _render_view(self):
+        """Redraw the framebuffer for the visible cells and show it."""
+        self.fb_view = r0, c0, r1, c1 = self._visible_window(VIEW_OVERSCAN)
+        scaled_size = int(TILE_SIZE * self.zoom)
         
-        # Composite wall and block
-        if wall_img and block_img:
-            img = self._composite_layers(wall_img, block_img)
-        elif wall_img:
-            img = wall_img
-        elif block_img:
-            img = block_img
-        else:
+        # Empty cells are transparent, with the grid lines along their top and left edges
+        self.empty_tile = np.zeros((scaled_size, scaled_size, 4), dtype=np.uint8)
+        if self._grid_shown():
+            self.empty_tile[0] = self.empty_tile[:, 0] = GRID_RGBA
+        self.framebuffer = np.tile(self.empty_tile, (r1 - r0, c1 - c0, 1))
+        
+        occupied = self._has_wall(r0, c0, r1, c1) | (self.blocks[r0:r1, c0:c1] >= 0)
+        self._draw_cells(r0, c0, r1, c1, occupied)
+        
+        self.fb_dirty = None
+        self._blit()
+    
+    def _grid_shown(self):
+        return hasattr(self, 'show_grid_var') and self.show_grid_var.get()
+    
+    def _blit(self):
+        """Copy the framebuffer (or just its dirty cells) to its PhotoImage on the canvas."""
+        if self.fb_job is not None:
+            self.root.after_cancel(self.fb_job)
+            self.fb_job = None
+        dirty, self.fb_dirty = self.fb_dirty, None
+        if self.framebuffer is None:
+            return
+        if not self.framebuffer.size:
+            # Nothing of the grid in view
+            if self.fb_item is not None:
+                self.canvas.itemconfig(self.fb_item, state='hidden')
             return
         
-        # Composite onto solid background
-        img = self._composite_on_bg(img)
+        h, w = self.framebuffer.shape[:2]
+        if dirty is not None and self.fb_photo is not None and (self.fb_photo.width(), self.fb_photo.height()) == (w, h):
+            # Copy only the changed cells, through a small patch image
+            r0, c0 = self.fb_view[:2]
+            scaled_size = int(TILE_SIZE * self.zoom)
+            y0, x0 = (dirty[0] - r0) * scaled_size, (dirty[1] - c0) * scaled_size
+            y1, x1 = (dirty[2] - r0) * scaled_size, (dirty[3] - c0) * scaled_size
+            patch = Image.fromarray(self.framebuffer[y0:y1, x0:x1], 'RGBA')
+            if self.fb_patch is not None and (self.fb_patch.width(), self.fb_patch.height()) == patch.size:
+                self.fb_patch.paste(patch)
+            else:
+                self.fb_patch = ImageTk.PhotoImage(patch)
+            self.canvas.tk.call(str(self.fb_photo), 'copy', str(self.fb_patch),
+                                '-to', x0, y0, '-compositingrule', 'set')
+            return
         
-        # Scale for zoom
-        if self.zoom != 1.0:
-            new_size = (int(img.width * self.zoom), int(img.height * self.zoom))
-            img = img.resize(new_size, Image.NEAREST)
+        img = Image.fromarray(self.framebuffer, 'RGBA')
+        if self.fb_photo is not None and (self.fb_photo.width(), self.fb_photo.height()) == img.size:
+            self.fb_photo.paste(img)
+        else:
+            self.fb_photo = ImageTk.PhotoImage(img)
         
-        photo = ImageTk.PhotoImage(img)
-        self.photos[(row, col)] = photo
-        self.canvas.create_image(x, y, anchor=tk.NW, image=photo, tags=f'c_{row}_{col}')
+        scaled_size = int(TILE_SIZE * self.zoom)
+        x, y = self.fb_view[1] * scaled_size, self.fb_view[0] * scaled_size
+        if self.fb_item is None:
+            self.fb_item = self.canvas.create_image(x, y, anchor=tk.NW, image=self.fb_photo, tags='cells')
+        else:
+            # Keep the item (and its stacking order) - just move and retarget it
+            self.canvas.coords(self.fb_item, x, y)
+            self.canvas.itemconfig(self.fb_item, image=self.fb_photo, state='normal')
+    
+    def _schedule_render(self):
+        """Full render once the canvas is idle, coalescing repeated requests."""
+        if self.render_job is None:
+            self.render_job = self.root.after_idle(self._do_render)
+    
+    def _do_render(self):
+        self.render_job = None
+        self._render()
+    
+    def _on_scroll(self, scrollbar, first, last):
+        """Canvas scroll callback - update the scrollbar and the visible cells."""
+        scrollbar.set(first, last)
+        self._schedule_view_update()
+    
+    def _schedule_view_update(self):
+        """Check the visible cells once the canvas is idle (scroll/resize)."""
+        if self.view_job is None:
+            self.view_job = self.root.after_idle(self._update_view)
+    
+    def _update_view(self):
+        """Re-render the framebuffer if cells outside it (and its overscan) came into view."""
+        self.view_job = None
+        if self.fb_view is None:
+            return
+        r0, c0, r1, c1 = self._visible_window()
+        fr0, fc0, fr1, fc1 = self.fb_view
+        if r0 < fr0 or c0 < fc0 or r1 > fr1 or c1 > fc1:
+            self._render_view()
     
     def _render(self):
         self.canvas.delete('all')
-        self.photos.clear()
+        self.cursor_sig = None
+        self.cursor_rects, self.cursor_images, self.cursor_shown = [], [], (0, 0)
+        self.fb_item = None
         
         scaled_size = int(TILE_SIZE * self.zoom)
         w, h = self.cols * scaled_size, self.rows * scaled_size
@@ -2478,8 +2864,10 @@ NAVIGATION:
         # Update scroll region
         self.canvas.config(scrollregion=(0, 0, w, h))
         
-        # Draw background - darker for contrast
-        self.canvas.create_rectangle(0, 0, w, h, fill='#11111b', outline='', tags='bg')
+        # Draw background - darker for contrast. Its outline closes off the grid
+        # lines, which are drawn into the empty cells of the framebuffer.
+        outline = GRID_COLOR if self._grid_shown() else ''
+        self.canvas.create_rectangle(0, 0, w, h, fill='#11111b', outline=outline, tags='bg')
         
         # Draw reference image if enabled
         if hasattr(self, 'show_reference') and self.show_reference and self.reference_image:
@@ -2501,29 +2889,15 @@ NAVIGATION:
             except Exception as e:
                 print(f"Error rendering reference: {e}")
         
-        # Draw subtle grid lines (if enabled)
-        if hasattr(self, 'show_grid_var') and self.show_grid_var.get():
-            grid_color = '#1e1e2e'
-            for r in range(self.rows + 1):
-                y = r * scaled_size
-                self.canvas.create_line(0, y, w, y, fill=grid_color, tags='grid')
-            for c in range(self.cols + 1):
-                x = c * scaled_size
-                self.canvas.create_line(x, 0, x, h, fill=grid_color, tags='grid')
-        
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                if cell['wall'] or cell['block']:
-                    self._render_cell(r, c)
+        # Cells and grid lines for the visible part of the grid
+        self._render_view()
     
     # =========== UNDO/REDO SYSTEM ===========
     
     def _save_undo(self):
         """Save current grid state to undo stack."""
-        # Deep copy the grid
-        state = [[cell.copy() for cell in row] for row in self.grid]
-        self.undo_stack.append(state)
+        # Copy the grid arrays
+        self.undo_stack.append(self._grid_state())
         
         # Limit stack size
         if len(self.undo_stack) > self.max_undo:
@@ -2532,6 +2906,30 @@ NAVIGATION:
         # Clear redo stack on new action
         self.redo_stack.clear()
     
+    def _grid_state(self):
+        """Snapshot of the grid for the undo/redo stacks."""
+        return self.walls.copy(), self.blocks.copy(), self.furn_frames.copy()
+    
+    def _restore_grid_state(self, state):
+        """Restore a _grid_state() snapshot, including its size."""
+        walls, blocks, furn_frames = state
+        self.walls, self.blocks, self.furn_frames = walls, blocks, furn_frames
+        self.rows, self.cols = walls.shape
+    
+    def _switch_grid_state(self, state):
+        """Restore an undo/redo snapshot, redrawing only the cells it changes.
+        
+        A snapshot of a different size (or a full render already pending)
+        falls back to a full render.
+        """
+        walls, blocks, furn_frames = self.walls, self.blocks, self.furn_frames
+        self._restore_grid_state(state)
+        if self.render_job is not None or walls.shape != self.walls.shape:
+            self._schedule_render()
+            return
+        changed = (walls != self.walls) | (blocks != self.blocks) | (furn_frames != self.furn_frames)
+        self._render_cells(np.argwhere(changed).tolist())
+    
     def _undo(self):
         """Undo last action."""
         if not self.undo_stack:
@@ -2539,12 +2937,10 @@ NAVIGATION:
             return
         
         # Save current state to redo
-        current = [[cell.copy() for cell in row] for row in self.grid]
-        self.redo_stack.append(current)
+        self.redo_stack.append(self._grid_state())
         
         # Restore previous state
-        self.grid = self.undo_stack.pop()
-        self._render()
+        self._switch_grid_state(self.undo_stack.pop())
         self.status.set(f"Undo ({len(self.undo_stack)} left)")
     
     def _redo(self):
@@ -2554,12 +2950,10 @@ NAVIGATION:
             return
         
         # Save current to undo
-        current = [[cell.copy() for cell in row] for row in self.grid]
-        self.undo_stack.append(current)
+        self.undo_stack.append(self._grid_state())
         
         # Restore redo state
-        self.grid = self.redo_stack.pop()
-        self._render()
+        self._switch_grid_state(self.redo_stack.pop())
         self.status.set(f"Redo ({len(self.redo_stack)} left)")
     
     # =========== PROJECT SAVE/LOAD ===========
@@ -2586,16 +2980,15 @@ NAVIGATION:
         }
         
         # Serialize grid - only non-empty cells to save space
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                if cell['wall'] or cell['block']:
-                    entry = {'r': r, 'c': c}
-                    if cell['wall']:
-                        entry['wall'] = cell['wall']
-                    if cell['block']:
-                        entry['block'] = list(cell['block'])  # Convert tuple to list for JSON
-                    project['grid'].append(entry)
+        for r, c in self._occupied_cells():
+            entry = {'r': r, 'c': c}
+            wall = self._get_wall(r, c)
+            block_data = self._get_block_data(r, c)
+            if wall is not None:
+                entry['wall'] = wall
+            if block_data:
+                entry['block'] = list(block_data)  # Convert tuple to list for JSON
+            project['grid'].append(entry)
         
         try:
             with open(path, 'w') as f:
@@ -2627,23 +3020,18 @@ NAVIGATION:
             new_cols = project.get('cols', 64)
             new_rows = project.get('rows', 40)
             
-            if new_cols != self.cols or new_rows != self.rows:
-                self.cols, self.rows = new_cols, new_rows
-                self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
-            else:
-                # Clear existing grid
-                for r in range(self.rows):
-                    for c in range(self.cols):
-                        self.grid[r][c] = {'wall': None, 'block': None}
+            # Start from an empty grid of the project's size
+            self.cols, self.rows = new_cols, new_rows
+            self._alloc_grid()
             
             # Load grid data
             for entry in project.get('grid', []):
                 r, c = entry['r'], entry['c']
                 if 0 <= r < self.rows and 0 <= c < self.cols:
                     if 'wall' in entry:
-                        self.grid[r][c]['wall'] = entry['wall']
+                        self.walls[r, c] = entry['wall']
                     if 'block' in entry:
-                        self.grid[r][c]['block'] = tuple(entry['block'])
+                        self._set_block_data(r, c, tuple(entry['block']))
             
             self.project_path = path
             self._render()
@@ -2721,7 +3109,7 @@ NAVIGATION:
                 
                 self._save_undo()
                 self.cols, self.rows = new_cols, new_rows
-                self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
+                self._alloc_grid()
                 self.project_path = None
                 self._render()
                 self.status.set(f"New canvas: {new_cols}x{new_rows}")
@@ -2807,7 +3195,7 @@ NAVIGATION:
             
             # Resize grid if needed
             self.cols, self.rows = width, height
-            self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
+            self._alloc_grid()
             
             # Parse tiles
             tiles = data.get('Tiles', [])
@@ -2818,7 +3206,7 @@ NAVIGATION:
                 if 0 <= y < self.rows and 0 <= x < self.cols:
                     # Check for wall
                     if tile.get('Wall'):
-                        self.grid[y][x]['wall'] = tile['Wall']
+                        self.walls[y, x] = tile['Wall']
                     
                     # Check for tile
                     if tile.get('IsActive') and tile.get('Type') is not None:
@@ -2828,9 +3216,9 @@ NAVIGATION:
                             # This is furniture with frame coords
                             u, v = tile['U'], tile['V']
                             fx, fy = u // TILE_SIZE, v // TILE_SIZE
-                            self.grid[y][x]['block'] = ('furn', tile_type, fx, fy)
+                            self._set_block_data(y, x, ('furn', tile_type, fx, fy))
                         else:
-                            self.grid[y][x]['block'] = ('block', tile_type)
+                            self._set_block_data(y, x, ('block', tile_type))
             
             self.project_path = None
             self._render()
@@ -2936,12 +3324,7 @@ NAVIGATION:
                     new_rows = max(self.rows, needed_h)
                     
                     # Expand grid
-                    for row in self.grid:
-                        row.extend([{'wall': None, 'block': None} for _ in range(new_cols - self.cols)])
-                    for _ in range(new_rows - self.rows):
-                        self.grid.append([{'wall': None, 'block': None} for _ in range(new_cols)])
-                    
-                    self.cols, self.rows = new_cols, new_rows
+                    self._resize_grid_arrays(new_rows, new_cols)
                 
                 # Save undo
                 self._save_undo()
@@ -2956,23 +3339,21 @@ NAVIGATION:
                         dest_y = py + ty
                         
                         if 0 <= dest_y < self.rows and 0 <= dest_x < self.cols:
-                            cell = self.grid[dest_y][dest_x]
-                            
                             # Wall
                             if tile.get('Wall'):
-                                if overwrite_var.get() or cell['wall'] is None:
-                                    cell['wall'] = tile['Wall']
+                                if overwrite_var.get() or self._get_wall(dest_y, dest_x) is None:
+                                    self.walls[dest_y, dest_x] = tile['Wall']
                             
                             # Block
                             if tile.get('IsActive') and tile.get('Type') is not None:
-                                if overwrite_var.get() or cell['block'] is None:
+                                if overwrite_var.get() or self.blocks[dest_y, dest_x] < 0:
                                     tile_type = tile['Type']
                                     if tile.get('U') is not None and tile.get('V') is not None:
                                         u, v = tile['U'], tile['V']
                                         fx, fy = u // TILE_SIZE, v // TILE_SIZE
-                                        cell['block'] = ('furn', tile_type, fx, fy)
+                                        self._set_block_data(dest_y, dest_x, ('furn', tile_type, fx, fy))
                                     else:
-                                        cell['block'] = ('block', tile_type)
+                                        self._set_block_data(dest_y, dest_x, ('block', tile_type))
                 else:
                     # TPaint format
                     for entry in data.get('grid', []):
@@ -2981,14 +3362,12 @@ NAVIGATION:
                         dest_y = py + r
                         
                         if 0 <= dest_y < self.rows and 0 <= dest_x < self.cols:
-                            cell = self.grid[dest_y][dest_x]
-                            
                             if 'wall' in entry:
-                                if overwrite_var.get() or cell['wall'] is None:
-                                    cell['wall'] = entry['wall']
+                                if overwrite_var.get() or self._get_wall(dest_y, dest_x) is None:
+                                    self.walls[dest_y, dest_x] = entry['wall']
                             if 'block' in entry:
-                                if overwrite_var.get() or cell['block'] is None:
-                                    cell['block'] = tuple(entry['block'])
+                                if overwrite_var.get() or self.blocks[dest_y, dest_x] < 0:
+                                    self._set_block_data(dest_y, dest_x, tuple(entry['block']))
                 
                 dialog.destroy()
                 self._render()
@@ -3033,7 +3412,7 @@ NAVIGATION:
                 if resize:
                     self._save_undo()
                     self.cols, self.rows = tiles_w, tiles_h
-                    self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
+                    self._alloc_grid()
             
             # Scale to fit canvas
             canvas_w = self.cols * TILE_SIZE
@@ -3054,11 +3433,11 @@ NAVIGATION:
     def _eyedropper(self, row, col):
         """Pick tile/wall from canvas at position."""
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            cell = self.grid[row][col]
+            block_data = self._get_block_data(row, col)
+            wall_id = self._get_wall(row, col)
             
             # Check block layer first
-            if cell['block']:
-                block_data = cell['block']
+            if block_data:
                 if block_data[0] == 'block':
                     self.block_id = block_data[1]
                     name = self.cache.tile_info.get(self.block_id, {}).get('name', f'Tile {self.block_id}')
@@ -3072,8 +3451,8 @@ NAVIGATION:
                 return
             
             # Otherwise check wall layer
-            if cell['wall']:
-                self.wall_id = cell['wall']
+            if wall_id is not None:
+                self.wall_id = wall_id
                 name = self.cache.wall_info.get(self.wall_id, {}).get('name', f'Wall {self.wall_id}')
                 self.status.set(f"Picked wall: {name}")
                 self._set_tool('wall')
@@ -3107,7 +3486,7 @@ NAVIGATION:
     
     def _clear(self):
         self._save_undo()  # Save before clearing
-        self.grid = [[{'wall': None, 'block': None} for _ in range(self.cols)] for _ in range(self.rows)]
+        self._alloc_grid()
         self._render()
         self.status.set("Cleared!")
     
@@ -3138,33 +3517,68 @@ NAVIGATION:
         img = Image.new('RGBA', (self.cols*TILE_SIZE, self.rows*TILE_SIZE), (10,10,26,255))
         
         # First pass: render all walls
-        for r in range(self.rows):
-            for c in range(self.cols):
-                wall_id = self.grid[r][c]['wall']
-                if wall_id:
-                    tile = self.cache.get_wall(wall_id)
-                    if tile:
-                        img.paste(tile, (c*TILE_SIZE, r*TILE_SIZE), tile)
-        
-        # Second pass: render all blocks/furniture on top
-        for r in range(self.rows):
-            for c in range(self.cols):
-                block_data = self.grid[r][c]['block']
-                if block_data:
-                    tile = None
-                    if block_data[0] == 'block':
-                        neighbors = self._get_neighbors(r, c, 'block')
-                        tile = self.cache.get_block(block_data[1], neighbors)
-                    elif block_data[0] == 'furn' and block_data[2] == 0 and block_data[3] == 0:
-                        tile = self.cache.get_furniture(block_data[1])
-                    
-                    if tile:
-                        img.paste(tile, (c*TILE_SIZE, r*TILE_SIZE), tile)
+        def wall_tile(wid):
+            tile = self.cache.get_wall(wid)
+            return np.asarray(tile) if tile else None
+        self._paste_layer(img, self._tile_layer(np.where(self._has_wall(), self.walls, -1), wall_tile))
+        
+        # Second pass: blocks/furniture on top. Anything bigger than a cell only
+        # spreads right and down, so drawing those first (in row-major order) and
+        # the plain 16x16 blocks over them gives the same stacking as cell order.
+        solid = self._solid_blocks()
+        keys = np.where(solid, self.blocks.astype(np.int32) * 16 + neighbor_masks(solid), -1)
+        big = {}
+        def block_tile(key):
+            tile = self.cache.get_block(key // 16, key % 16)
+            if not tile:
+                return None
+            if tile.size != (TILE_SIZE, TILE_SIZE):
+                big[key] = tile
+                return None
+            return np.asarray(tile)
+        blocks = self._tile_layer(keys, block_tile)
+        
+        overlays = [(r, c, self.cache.get_furniture(int(self.blocks[r, c])))
+                    for r, c in np.argwhere(self.furn_frames == 0).tolist()]
+        if big:
+            overlays += [(r, c, big[keys[r, c]]) for r, c in np.argwhere(np.isin(keys, list(big))).tolist()]
+        for r, c, tile in sorted(overlays, key=lambda o: (o[0], o[1])):
+            if tile:
+                img.paste(tile, (c*TILE_SIZE, r*TILE_SIZE), tile)
+        self._paste_layer(img, blocks)
         
         img.save(path)
         self.status.set(f"Exported PNG: {os.path.basename(path)}")
         messagebox.showinfo("Export", "PNG image saved!")
     
+    def _tile_layer(self, keys, tile_for):
+        """Assemble one 16x16 tile per cell into a single RGBA layer.
+        
+        keys is a (rows, cols) int array (-1 for nothing) and tile_for(key)
+        gives the tile array for a key, or None. Returns (layer image, (x, y))
+        covering just the occupied cells, or None if there are none.
+        """
+        rs, cs = np.nonzero(keys >= 0)
+        if not len(rs):
+            return None
+        r0, r1, c0, c1 = rs.min(), rs.max() + 1, cs.min(), cs.max() + 1
+        uniq, inv = np.unique(keys[r0:r1, c0:c1], return_inverse=True)
+        table = np.zeros((len(uniq), TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+        for i, key in enumerate(uniq.tolist()):
+            tile = tile_for(key) if key >= 0 else None
+            if tile is not None:
+                table[i] = tile
+        # (rows, cols, 16, 16, 4) tiles -> one image
+        layer = table[inv.reshape(r1 - r0, c1 - c0)].transpose(0, 2, 1, 3, 4)
+        layer = layer.reshape((r1 - r0) * TILE_SIZE, (c1 - c0) * TILE_SIZE, 4)
+        return Image.fromarray(layer, 'RGBA'), (int(c0) * TILE_SIZE, int(r0) * TILE_SIZE)
+    
+    def _paste_layer(self, img, layer):
+        """Alpha-paste a _tile_layer result onto img in one call."""
+        if layer is not None:
+            tiles, pos = layer
+            img.paste(tiles, pos, tiles)
+    
     def _export_tpaint(self, path):
         """Export as TPaint project file."""
         import json
@@ -3176,16 +3590,15 @@ NAVIGATION:
             'grid': []
         }
         
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                if cell['wall'] or cell['block']:
-                    entry = {'r': r, 'c': c}
-                    if cell['wall']:
-                        entry['wall'] = cell['wall']
-                    if cell['block']:
-                        entry['block'] = list(cell['block'])
-                    project['grid'].append(entry)
+        for r, c in self._occupied_cells():
+            entry = {'r': r, 'c': c}
+            wall = self._get_wall(r, c)
+            block_data = self._get_block_data(r, c)
+            if wall is not None:
+                entry['wall'] = wall
+            if block_data:
+                entry['block'] = list(block_data)
+            project['grid'].append(entry)
         
         try:
             with open(path, 'w') as f:
@@ -3216,16 +3629,16 @@ NAVIGATION:
         for r in range(self.rows):
             row_data = []
             for c in range(self.cols):
-                cell = self.grid[r][c]
+                wall_id = self._get_wall(r, c)
+                block_data = self._get_block_data(r, c)
                 tile_obj = {}
                 
                 # Wall
-                if cell['wall']:
-                    tile_obj['Wall'] = cell['wall']
+                if wall_id is not None:
+                    tile_obj['Wall'] = wall_id
                 
                 # Block/Tile
-                if cell['block']:
-                    block_data = cell['block']
+                if block_data:
                     if block_data[0] == 'block':
                         tile_obj['IsActive'] = True
                         tile_obj['Type'] = block_data[1]